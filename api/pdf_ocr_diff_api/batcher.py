@@ -0,0 +1,241 @@
+"""Shared OCR worker pool that batches page jobs across concurrent requests."""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional, Sequence, Set, Tuple, Union
+
+from pdf_ocr_diff.models import PageData
+from pdf_ocr_diff.ocr import process_page_files
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# (image_path, page_number, clean_stray_chars, result future)
+_Job = Tuple[str, int, bool, asyncio.Future]
+
+
+def _ocr_batch(image_paths: List[str], clean_stray_chars: bool) -> List[Union[PageData, Exception]]:
+    """
+    OCR a batch of page images with a single Tesseract run.
+
+    If the run fails, the pages are retried one at a time so that a bad page
+    only fails its own job rather than every job in the batch.
+
+    Args:
+        image_paths: Paths of the page images, possibly from several requests
+        clean_stray_chars: Whether to apply stray character cleaning
+
+    Returns:
+        For each path, its PageData or the exception raised while OCR'ing it
+    """
+    try:
+        return process_page_files(image_paths, clean_stray_chars=clean_stray_chars)
+    except Exception as e:
+        if len(image_paths) == 1:
+            return [e]
+
+    results = []
+    for image_path in image_paths:
+        try:
+            results.extend(process_page_files([image_path], clean_stray_chars=clean_stray_chars))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _fail(future: asyncio.Future, exc: Exception) -> None:
+    """Set an exception on a job's future unless it is already done."""
+    if not future.done():
+        future.set_exception(exc)
+
+
+class OCRBatcher:
+    """
+    Coalesce page OCR jobs from in-flight requests into batched Tesseract runs.
+
+    Every request pushes its rendered page files onto a single queue. A
+    background task drains the queue in batches and OCRs each batch with one
+    Tesseract run (``process_page_files``) on an executor shared by all
+    requests, so concurrent requests share a bounded number of OCR workers.
+
+    A Tesseract run OCRs its pages one after another, so batches are sized
+    to keep the workers busy first: while workers are idle, the queued pages
+    are spread across them, and runs are only combined as far as needed to
+    cover the backlog. Once every worker is busy, a batch waits at most
+    ``max_delay_ms`` to fill up to ``max_batch_size`` jobs, paying Tesseract's
+    process start and model load once per batch rather than once per page.
+
+    The executor uses threads: Tesseract runs as a subprocess, so workers
+    spend their time outside the GIL.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_batch_size: int = 8,
+                 max_delay_ms: int = 10):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._task: Optional[asyncio.Task] = None
+        # Jobs taken off the queue for the batch being collected
+        self._pending: List[_Job] = []
+        # Batches handed to the executor that haven't finished
+        self._running: Set[Future] = set()
+
+    async def start(self) -> None:
+        """Start the worker pool and the background dispatch task."""
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="ocr"
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"OCR batcher started with {self.max_workers} workers")
+
+    async def stop(self) -> None:
+        """
+        Stop dispatching and shut down the worker pool.
+
+        Jobs that are queued, being collected into a batch, or in a batch that
+        hasn't started yet are failed; batches already running finish first.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        stopped = RuntimeError("OCR batcher stopped")
+        for job in self._pending:
+            _fail(job[3], stopped)
+        self._pending = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                _fail(self._queue.get_nowait()[3], stopped)
+            self._queue = None
+
+        # Batches that haven't started are cancelled (and their jobs failed);
+        # running ones can't be and deliver their results as usual
+        for work in list(self._running):
+            work.cancel()
+
+        if self._executor is not None:
+            # Joining the worker threads blocks, so do it off the event loop
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    async def submit(self, image_path: str, page_number: int,
+                     clean_stray_chars: bool = True) -> PageData:
+        """
+        Queue a single page for OCR and wait for its result.
+
+        Args:
+            image_path: Path to the rendered page image
+            page_number: Page number (1-indexed)
+            clean_stray_chars: Whether to apply stray character cleaning
+
+        Returns:
+            PageData for the page
+        """
+        if self._queue is None:
+            raise RuntimeError("OCR batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image_path, page_number, clean_stray_chars, future))
+        return await future
+
+    async def process_images(self, image_paths: Sequence[str],
+                             clean_stray_chars: bool = True) -> List[PageData]:
+        """
+        OCR all pages of a rendered document, preserving page order.
+
+        Args:
+            image_paths: Paths to the page images in document order
+            clean_stray_chars: Whether to apply stray character cleaning
+
+        Returns:
+            List of PageData objects, one per page
+        """
+        return list(await asyncio.gather(*(
+            self.submit(image_path, page_num, clean_stray_chars)
+            for page_num, image_path in enumerate(image_paths, start=1)
+        )))
+
+    async def _run(self) -> None:
+        """Drain the queue in batches and hand each batch to the executor."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            self._pending = [await self._queue.get()]
+            idle_workers = self.max_workers - len(self._running)
+
+            if idle_workers > 0:
+                # Spread the backlog over the idle workers without waiting
+                backlog = len(self._pending) + self._queue.qsize()
+                batch_size = min(self.max_batch_size, -(-backlog // idle_workers))
+                while len(self._pending) < batch_size:
+                    self._pending.append(self._queue.get_nowait())
+            else:
+                # Every worker is busy; give the batch a moment to fill
+                deadline = loop.time() + self.max_delay
+                while len(self._pending) < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+            batch, self._pending = self._pending, []
+            jobs = [job for job in batch if not job[3].cancelled()]
+
+            # Cleaning happens after OCR, per page, but process_page_files
+            # takes one setting, so each setting gets its own run
+            for clean_stray_chars in (True, False):
+                group = [job for job in jobs if job[2] == clean_stray_chars]
+                if group:
+                    self._dispatch(loop, group, clean_stray_chars)
+
+    def _dispatch(self, loop: asyncio.AbstractEventLoop, jobs: List[_Job],
+                  clean_stray_chars: bool) -> None:
+        """Run one batch on the executor and forward each page to its caller."""
+        work = self._executor.submit(_ocr_batch, [job[0] for job in jobs], clean_stray_chars)
+        self._running.add(work)
+
+        def _forward(done: asyncio.Future) -> None:
+            self._running.discard(work)
+            if done.cancelled():
+                for job in jobs:
+                    _fail(job[3], RuntimeError("OCR batcher stopped"))
+                return
+            if done.exception() is not None:
+                for job in jobs:
+                    _fail(job[3], done.exception())
+                return
+
+            for (_, page_number, _, future), result in zip(jobs, done.result()):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    # The batch numbers its pages from 1; restore the job's own
+                    result.page_number = page_number
+                    future.set_result(result)
+
+        asyncio.wrap_future(work, loop=loop).add_done_callback(_forward)
+
+
+# Shared batcher instance, started and stopped by the application lifespan.
+# Every server process builds its own, so by default the CPUs are divided
+# between processes rather than each one starting a worker per CPU.
+ocr_batcher = OCRBatcher(
+    max_workers=settings.ocr_max_workers or max(1, (os.cpu_count() or 1) // settings.workers),
+    max_batch_size=settings.ocr_batch_size,
+    max_delay_ms=settings.ocr_batch_delay_ms,
+)
@@ -1,7 +1,8 @@
 """Configuration settings for the PDF OCR Diff API."""
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import FrozenSet, Optional, Tuple
 
 
 class Settings(BaseSettings):
@@ -15,20 +16,26 @@ class Settings(BaseSettings):
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 1  # Server processes; OCR workers are divided between them
     
     # CORS Configuration
-    cors_origins: List[str] = [
+    cors_origins: Tuple[str, ...] = (
         "http://localhost:3000",
         "http://localhost:5173",
         "http://localhost:8000",
-    ]
+    )
     cors_allow_credentials: bool = True
-    cors_allow_methods: List[str] = ["*"]
-    cors_allow_headers: List[str] = ["*"]
+    cors_allow_methods: Tuple[str, ...] = ("*",)
+    cors_allow_headers: Tuple[str, ...] = ("*",)
     
     # File Upload Configuration
     max_file_size: int = 52428800  # 50MB in bytes
-    allowed_file_types: List[str] = [".pdf"]
+    allowed_file_types: FrozenSet[str] = frozenset({".pdf"})
+    
+    # OCR Worker Configuration
+    ocr_max_workers: Optional[int] = None  # Per process; defaults to CPU count / workers
+    ocr_batch_size: int = 8  # Max pages OCR'd by one Tesseract run
+    ocr_batch_delay_ms: int = 10  # Max wait for a batch to fill once every OCR worker is busy
     
     # Logging Configuration
     log_level: str = "INFO"
@@ -41,5 +48,21 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing env and .env only once."""
+    return Settings()
+
+
+# Event loop and HTTP parser for uvicorn: the C implementations when the
+# optional uvloop/httptools packages are installed, else uvicorn's defaults
+try:
+    import uvloop  # noqa: F401
+    import httptools  # noqa: F401
+    LOOP, HTTP = "uvloop", "httptools"
+except ImportError:
+    LOOP, HTTP = "auto", "auto"
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,69 +1,133 @@
 """Main FastAPI application with middleware and configuration."""
 
+import atexit
 import logging
+import queue
+import shutil
 import sys
+import tempfile
 import uuid
 from contextlib import asynccontextmanager
-from typing import Callable
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
 
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .batcher import ocr_batcher
 from .config import settings
 from .routes import router
 from .models import ErrorResponse
 
 
-# Configure logging
+# Configure logging: records are formatted and queued on the request path,
+# then written to stdout by a background listener started in the lifespan
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_listener = QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+
 logging.basicConfig(
     level=getattr(logging, settings.log_level.upper()),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)],
+    handlers=[QueueHandler(_log_queue)],
 )
 
 logger = logging.getLogger(__name__)
 
+# Security headers added to every response, pre-encoded for the raw ASGI header list
+_SECURITY_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+    (b"strict-transport-security", b"max-age=31536000; includeSubDomains"),
+]
+
+
+# Largest request body accepted: two maximum-size uploads plus room for the
+# multipart boundaries, part headers and form fields
+_MAX_REQUEST_SIZE = 2 * settings.max_file_size + (1 << 16)
+
+
+class RequestSizeLimitMiddleware:
+    """
+    Pure ASGI middleware that rejects oversized requests from their headers.
+
+    Uploads are only validated per file once Starlette has received and
+    spooled the whole multipart body, so a request whose Content-Length
+    already exceeds _MAX_REQUEST_SIZE is answered with 413 before any of the
+    body is read.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            content_length = dict(scope["headers"]).get(b"content-length", b"")
+            if content_length.isdigit() and int(content_length) > _MAX_REQUEST_SIZE:
+                response = ORJSONResponse(
+                    {"detail": f"File too large. Maximum size is {settings.max_file_size} bytes."},
+                    status_code=413,
+                )
+                await response(scope, receive, send)
+                return
+
+        await self.app(scope, receive, send)
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to all responses."""
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        response = await call_next(request)
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = (
-            "max-age=31536000; includeSubDomains"
-        )
-        return response
+class SecurityAndRequestIDMiddleware:
+    """
+    Pure ASGI middleware that tags requests with an ID and adds security headers.
 
+    Stores a request ID on ``request.state.request_id`` and adds it, together
+    with the security headers, to every HTTP response. Written against the raw
+    ASGI interface to avoid the task group and response buffering that
+    BaseHTTPMiddleware adds per layer.
+    """
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """Middleware to add request ID to all requests for tracing."""
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = request_id
-        return response
+        request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                headers = message.setdefault("headers", [])
+                headers.extend(_SECURITY_HEADERS)
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
+    _log_listener.start()
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"Debug mode: {settings.debug}")
     logger.info(f"CORS origins: {settings.cors_origins}")
+    await ocr_batcher.start()
+
+    # Per-worker scratch directory; requests work in unique subdirectories of it
+    app.state.scratch = Path(tempfile.mkdtemp(prefix="pdfdiff_"))
+    atexit.register(shutil.rmtree, app.state.scratch, ignore_errors=True)
 
     yield
 
     # Shutdown
     logger.info(f"Shutting down {settings.app_name}")
+    await ocr_batcher.stop()
+    shutil.rmtree(app.state.scratch, ignore_errors=True)
+    _log_listener.stop()
 
 
 # Create FastAPI application
@@ -72,11 +136,17 @@ app = FastAPI(
     version=settings.app_version,
     description="API for comparing PDF documents using OCR and spatial diff analysis",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
 )
 
 
+# Reject oversized uploads before their bodies are read. Added first so it
+# runs inside CORS and browsers can read the 413.
+app.add_middleware(RequestSizeLimitMiddleware)
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -87,12 +157,8 @@ app.add_middleware(
 )
 
 
-# Add security headers middleware
-app.add_middleware(SecurityHeadersMiddleware)
-
-
-# Add request ID middleware
-app.add_middleware(RequestIDMiddleware)
+# Add security headers and request ID middleware
+app.add_middleware(SecurityAndRequestIDMiddleware)
 
 
 # Global exception handler
@@ -105,11 +171,13 @@ async def global_exception_handler(request: Request, exc: Exception):
         f"Unhandled exception for request {request_id}: {str(exc)}", exc_info=True
     )
 
-    return JSONResponse(
+    error = ErrorResponse(
+        error="Internal server error", detail=str(exc) if settings.debug else None
+    )
+    return Response(
+        content=error.model_dump_json(exclude_none=True),
+        media_type="application/json",
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
-            error="Internal server error", detail=str(exc) if settings.debug else None
-        ).model_dump(),
     )
 
 
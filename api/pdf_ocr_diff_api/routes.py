@@ -1,21 +1,100 @@
 """API route handlers."""
 
+import asyncio
 import logging
-import tempfile
-import os
+import shutil
+import uuid
 from pathlib import Path
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from typing import Iterator, List
 
-from pdf_ocr_diff.ocr import process_pdf
-from pdf_ocr_diff.differ import compare_pdfs as compare_pdfs_core
+import orjson
+from fastapi import APIRouter, Request, UploadFile, File, Form, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from .models import HealthResponse, DiffResponse, BoundingBox, CharDiff, DiffItem
+from pdf_ocr_diff.ocr import render_pdf_to_files
+from pdf_ocr_diff.differ import compare_pdfs as compare_pdfs_core, get_unified_diff
+from pdf_ocr_diff.models import DiffResult, PageData
+
+from .models import HealthResponse, DiffResponse
+from .batcher import ocr_batcher
 from .config import settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Chunk size used when copying uploads to disk
+_UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Streamed responses are sent in buffers of at least this size; each chunk
+# costs a threadpool hop, so per-item chunks would dominate large diffs
+_STREAM_FLUSH_SIZE = 1 << 16  # 64 KiB
+
+
+async def _save_upload(upload: UploadFile, dst: Path) -> None:
+    """
+    Copy an uploaded file to disk in fixed-size chunks.
+
+    Copies from the underlying spooled file so the whole upload is never
+    held in memory as a single bytes object. The copy runs in the threadpool
+    to keep disk I/O off the event loop. The upload is closed afterwards so
+    its spooled copy is released before rendering and OCR start, leaving the
+    on-disk file as the only copy for the rest of the request.
+    """
+    await upload.seek(0)
+
+    def _copy() -> None:
+        with open(dst, "wb") as f:
+            shutil.copyfileobj(upload.file, f, length=_UPLOAD_CHUNK_SIZE)
+
+    try:
+        await run_in_threadpool(_copy)
+    finally:
+        await upload.close()
+
+
+def _diff_documents(pages_a: List[PageData], pages_b: List[PageData],
+                    name_a: str, name_b: str) -> DiffResult:
+    """
+    Compare two OCR'd documents, ready to be streamed.
+
+    The differ leaves each item's unified diff to be built on demand;
+    building them here, before any response is started, means a failure
+    still becomes a 500 instead of a truncated streamed body.
+    """
+    result = compare_pdfs_core(pages_a, pages_b, name_a, name_b)
+    for item in result.diff_items:
+        get_unified_diff(item)  # Stored on the item for _stream_result
+    return result
+
+
+def _stream_result(result: DiffResult) -> Iterator[bytes]:
+    """
+    Encode a DiffResult as JSON, a batch of diff items at a time.
+
+    Produces the same document as ``result.to_dict()`` without building the
+    full payload: items are encoded one by one and flushed in buffers of
+    about _STREAM_FLUSH_SIZE bytes, so peak memory is bounded by the buffer
+    and the largest single item rather than the whole response.
+    """
+    buffer = bytearray(b'{"pdf_a_path":')
+    buffer += orjson.dumps(result.pdf_a_path)
+    buffer += b',"pdf_b_path":' + orjson.dumps(result.pdf_b_path)
+    buffer += b',"total_pages_a":' + orjson.dumps(result.total_pages_a)
+    buffer += b',"total_pages_b":' + orjson.dumps(result.total_pages_b)
+    buffer += b',"total_differences":' + orjson.dumps(len(result.diff_items))
+    buffer += b',"diff_items":['
+    for i, item in enumerate(result.diff_items):
+        if i:
+            buffer += b","
+        buffer += orjson.dumps(item.to_dict())
+        if len(buffer) >= _STREAM_FLUSH_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
+    buffer += b"]}"
+    yield bytes(buffer)
+
 
 @router.get("/healthz", response_model=HealthResponse, tags=["Health"])
 async def health_check():
@@ -27,8 +106,15 @@ async def health_check():
     return HealthResponse(status="healthy", version=settings.app_version)
 
 
-@router.post("/v1/diff", response_model=DiffResponse, tags=["Diff"])
+@router.post(
+    "/v1/diff",
+    response_class=ORJSONResponse,
+    response_model=None,
+    responses={200: {"model": DiffResponse}},
+    tags=["Diff"],
+)
 async def compare_pdfs(
+    request: Request,
     file_a: UploadFile = File(..., description="First PDF file to compare"),
     file_b: UploadFile = File(..., description="Second PDF file to compare"),
     dpi: int = Form(300, description="DPI for PDF rendering (default: 300)"),
@@ -42,24 +128,34 @@ async def compare_pdfs(
         dpi: DPI resolution for PDF rendering (default: 300)
 
     Returns:
-        DiffResponse with comparison results
+        JSON response matching the DiffResponse schema
 
     Raises:
         HTTPException: If file validation fails or processing error occurs
     """
     # Validate file types
-    if not file_a.filename.endswith(".pdf"):
+    if Path(file_a.filename or "").suffix.lower() not in settings.allowed_file_types:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type for file_a: {file_a.filename}. Only PDF files are allowed.",
         )
 
-    if not file_b.filename.endswith(".pdf"):
+    if Path(file_b.filename or "").suffix.lower() not in settings.allowed_file_types:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid file type for file_b: {file_b.filename}. Only PDF files are allowed.",
         )
 
+    # Validate file sizes before copying or processing anything. Requests
+    # whose Content-Length is over the limit never get here (see
+    # RequestSizeLimitMiddleware); this catches a single oversized file and
+    # bodies sent without a Content-Length.
+    if (file_a.size or 0) > settings.max_file_size or (file_b.size or 0) > settings.max_file_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large. Maximum size is {settings.max_file_size} bytes.",
+        )
+
     # Validate DPI
     if dpi < 72 or dpi > 600:
         raise HTTPException(status_code=400, detail="DPI must be between 72 and 600")
@@ -67,108 +163,64 @@ async def compare_pdfs(
     # Log the diff operation
     logger.info(f"Diffing PDFs: {file_a.filename} vs {file_b.filename} at {dpi} DPI")
 
-    # Create temporary files for uploaded PDFs
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
+    # Work in a unique subdirectory of this worker's scratch directory
+    work_dir = request.app.state.scratch / uuid.uuid4().hex
+    work_dir.mkdir()
+    
+    # Save uploaded files under fixed names so client filenames never
+    # collide with each other or escape the working directory
+    pdf_a_path = work_dir / "a.pdf"
+    pdf_b_path = work_dir / "b.pdf"
+    
+    try:
+        # Write files to disk
+        await _save_upload(file_a, pdf_a_path)
+        await _save_upload(file_b, pdf_b_path)
         
-        # Save uploaded files
-        pdf_a_path = temp_path / file_a.filename
-        pdf_b_path = temp_path / file_b.filename
+        # Render both documents to page images in the working directory
+        # concurrently, then OCR their pages on the shared worker pool. Each
+        # worker opens its page file only while processing it, so rendered
+        # pages aren't all held in memory; the event loop stays free meanwhile.
+        logger.info(f"Processing PDFs: {pdf_a_path}, {pdf_b_path}")
+        image_paths_a, image_paths_b = await asyncio.gather(
+            run_in_threadpool(render_pdf_to_files, str(pdf_a_path), str(work_dir / "pages_a"), dpi=dpi),
+            run_in_threadpool(render_pdf_to_files, str(pdf_b_path), str(work_dir / "pages_b"), dpi=dpi),
+        )
+        pages_a, pages_b = await asyncio.gather(
+            ocr_batcher.process_images(image_paths_a),
+            ocr_batcher.process_images(image_paths_b),
+        )
         
-        try:
-            # Write files to disk
-            with open(pdf_a_path, "wb") as f:
-                content = await file_a.read()
-                f.write(content)
-            
-            with open(pdf_b_path, "wb") as f:
-                content = await file_b.read()
-                f.write(content)
-            
-            logger.info(f"Processing PDF A: {pdf_a_path}")
-            pages_a = process_pdf(str(pdf_a_path), dpi=dpi)
-            
-            logger.info(f"Processing PDF B: {pdf_b_path}")
-            pages_b = process_pdf(str(pdf_b_path), dpi=dpi)
-            
-            logger.info(f"Comparing documents...")
-            result = compare_pdfs_core(
-                pages_a,
-                pages_b,
-                file_a.filename,
-                file_b.filename,
-            )
-            
-            # Convert core DiffResult to API DiffResponse
-            diff_items = []
-            for item in result.diff_items:
-                # Convert bounding boxes
-                bboxes_a = [
-                    BoundingBox(
-                        x=bbox.x,
-                        y=bbox.y,
-                        width=bbox.width,
-                        height=bbox.height
-                    )
-                    for bbox in item.bounding_boxes_a
-                ]
-                
-                bboxes_b = [
-                    BoundingBox(
-                        x=bbox.x,
-                        y=bbox.y,
-                        width=bbox.width,
-                        height=bbox.height
-                    )
-                    for bbox in item.bounding_boxes_b
-                ]
-                
-                # Convert char diffs
-                char_diffs = [
-                    CharDiff(
-                        operation=cd.operation,
-                        text_a=cd.text_a,
-                        text_b=cd.text_b,
-                        start_a=cd.start_a,
-                        end_a=cd.end_a,
-                        start_b=cd.start_b,
-                        end_b=cd.end_b
-                    )
-                    for cd in item.char_diffs
-                ]
-                
-                diff_items.append(
-                    DiffItem(
-                        operation=item.operation.value,
-                        page_a=item.page_a,
-                        page_b=item.page_b,
-                        text_a=item.text_a,
-                        text_b=item.text_b,
-                        bounding_boxes_a=bboxes_a,
-                        bounding_boxes_b=bboxes_b,
-                        unified_diff=item.unified_diff,
-                        char_diffs=char_diffs
-                    )
-                )
-            
-            response = DiffResponse(
-                pdf_a_path=result.pdf_a_path,
-                pdf_b_path=result.pdf_b_path,
-                total_pages_a=result.total_pages_a,
-                total_pages_b=result.total_pages_b,
-                total_differences=len(result.diff_items),
-                diff_items=diff_items,
-            )
-            
-            logger.info(
-                f"Diff completed: {response.total_differences} differences found"
-            )
-            
-            return response
-            
-        except Exception as e:
-            logger.error(f"Error processing PDFs: {str(e)}", exc_info=True)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error processing PDFs: {str(e)}"
-            )
+        logger.info(f"Comparing documents...")
+        result = await run_in_threadpool(
+            _diff_documents,
+            pages_a,
+            pages_b,
+            file_a.filename,
+            file_b.filename,
+        )
+        
+        logger.info(f"Diff completed: {len(result.diff_items)} differences found")
+
+        # Fully-equal documents: nothing to stream, reply in one shot
+        if not result.diff_items:
+            return ORJSONResponse({
+                "pdf_a_path": result.pdf_a_path,
+                "pdf_b_path": result.pdf_b_path,
+                "total_pages_a": result.total_pages_a,
+                "total_pages_b": result.total_pages_b,
+                "total_differences": 0,
+                "diff_items": [],
+            })
+
+        # Stream the core result item by item; DiffResponse only documents the schema
+        return StreamingResponse(_stream_result(result), media_type="application/json")
+
+    except Exception as e:
+        logger.error(f"Error processing PDFs: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error processing PDFs: {str(e)}"
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
@@ -0,0 +1,21 @@
+"""Production server runner for the PDF OCR Diff API."""
+
+import uvicorn
+from pdf_ocr_diff_api.config import HTTP, LOOP, settings
+
+
+def main():
+    """Run the production server with the configured worker count and no reload."""
+    uvicorn.run(
+        "pdf_ocr_diff_api.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop=LOOP,
+        http=HTTP,
+        log_level=settings.log_level.lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
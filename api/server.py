@@ -1,7 +1,7 @@
 """Development server runner for the PDF OCR Diff API."""
 
 import uvicorn
-from pdf_ocr_diff_api.config import settings
+from pdf_ocr_diff_api.config import HTTP, LOOP, settings
 
 
 def main():
@@ -11,6 +11,8 @@ def main():
         host=settings.host,
         port=settings.port,
         reload=True,
+        loop=LOOP,
+        http=HTTP,
         log_level=settings.log_level.lower(),
     )
 
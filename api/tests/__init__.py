@@ -0,0 +1 @@
+"""Tests for pdf-ocr-diff-api."""
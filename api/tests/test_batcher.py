@@ -0,0 +1,183 @@
+"""Tests for the shared OCR batcher."""
+
+import asyncio
+import threading
+
+from PIL import Image
+
+from pdf_ocr_diff import ocr
+from pdf_ocr_diff_api.batcher import OCRBatcher
+
+_TSV_HEADER = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+               "left", "top", "width", "height", "conf", "text")
+
+
+def _page_images(tmp_path, name, count):
+    """Write blank page images for a document and return their paths."""
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"{name}-{i + 1}.png"
+        Image.new("L", (800, 600)).save(path)
+        paths.append(str(path))
+    return paths
+
+
+def _fake_run_tesseract(calls, on_run=None):
+    """
+    Stand-in for pytesseract's run_tesseract over a list file of images.
+
+    Each image is "read" as one word: its file name without the extension.
+    The image paths of every run are appended to calls, and on_run (if given)
+    is called with them before any output is written.
+    """
+    def run_tesseract(input_filename, output_filename_base, extension, lang, config=''):
+        with open(input_filename) as list_file:
+            image_paths = list_file.read().split()
+        calls.append(image_paths)
+        if on_run is not None:
+            on_run(image_paths)
+        lines = ["\t".join(_TSV_HEADER)]
+        for page_num, image_path in enumerate(image_paths, start=1):
+            word = image_path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+            lines.append(f"1\t{page_num}\t0\t0\t0\t0\t0\t0\t800\t600\t-1\t")
+            lines.append(f"5\t{page_num}\t1\t1\t1\t1\t10\t20\t40\t15\t95\t{word}")
+        with open(output_filename_base + ".tsv", "w") as tsv_file:
+            tsv_file.write("\n".join(lines) + "\n")
+    return run_tesseract
+
+
+def _texts(pages):
+    """Text of each page's single block."""
+    return [page.text_blocks[0].text for page in pages]
+
+
+def test_single_request_spreads_across_workers(tmp_path, monkeypatch):
+    """Test that one document is split over idle workers instead of one run."""
+    paths = _page_images(tmp_path, "doc", 8)
+    calls = []
+    monkeypatch.setattr(ocr, "run_tesseract", _fake_run_tesseract(calls))
+
+    async def scenario():
+        batcher = OCRBatcher(max_workers=4, max_batch_size=8)
+        await batcher.start()
+        try:
+            return await batcher.process_images(paths)
+        finally:
+            await batcher.stop()
+
+    pages = asyncio.run(scenario())
+
+    assert sorted(len(run) for run in calls) == [2, 2, 2, 2]
+    assert [page.page_number for page in pages] == list(range(1, 9))
+    assert _texts(pages) == [f"doc-{n}" for n in range(1, 9)]
+
+
+def test_page_numbers_across_documents(tmp_path, monkeypatch):
+    """Test that pages from several documents OCR'd in one run keep their numbers."""
+    paths_a = _page_images(tmp_path, "a", 3)
+    paths_b = _page_images(tmp_path, "b", 2)
+    calls = []
+    monkeypatch.setattr(ocr, "run_tesseract", _fake_run_tesseract(calls))
+
+    async def scenario():
+        batcher = OCRBatcher(max_workers=1, max_batch_size=8)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.process_images(paths_a),
+                batcher.process_images(paths_b),
+            )
+        finally:
+            await batcher.stop()
+
+    pages_a, pages_b = asyncio.run(scenario())
+
+    # The only worker was idle, so both documents shared one run
+    assert len(calls) == 1
+    assert [page.page_number for page in pages_a] == [1, 2, 3]
+    assert [page.page_number for page in pages_b] == [1, 2]
+    assert _texts(pages_a) == ["a-1", "a-2", "a-3"]
+    assert _texts(pages_b) == ["b-1", "b-2"]
+
+
+def test_failing_page_fails_only_its_request(tmp_path, monkeypatch):
+    """Test that a page Tesseract can't read doesn't fail other requests in its batch."""
+    paths_a = _page_images(tmp_path, "a", 2)
+    paths_b = _page_images(tmp_path, "b", 2)
+    bad_page = paths_b[1]
+    calls = []
+
+    def on_run(image_paths):
+        if bad_page in image_paths:
+            raise RuntimeError("Tesseract failed")
+
+    monkeypatch.setattr(ocr, "run_tesseract", _fake_run_tesseract(calls, on_run))
+
+    async def scenario():
+        batcher = OCRBatcher(max_workers=1, max_batch_size=8)
+        await batcher.start()
+        try:
+            return await asyncio.gather(
+                batcher.process_images(paths_a),
+                batcher.process_images(paths_b),
+                return_exceptions=True,
+            )
+        finally:
+            await batcher.stop()
+
+    pages_a, error_b = asyncio.run(scenario())
+
+    # One combined run, then one retry per page
+    assert [len(run) for run in calls] == [4, 1, 1, 1, 1]
+    assert _texts(pages_a) == ["a-1", "a-2"]
+    assert [page.page_number for page in pages_a] == [1, 2]
+    assert isinstance(error_b, RuntimeError)
+    assert str(error_b) == "Tesseract failed"
+
+
+def test_stop_with_jobs_in_flight(tmp_path, monkeypatch):
+    """Test that stop() lets a running batch finish and fails the jobs still waiting."""
+    paths = _page_images(tmp_path, "doc", 5)
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def on_run(image_paths):
+        started.set()
+        release.wait(timeout=5)
+
+    monkeypatch.setattr(ocr, "run_tesseract", _fake_run_tesseract(calls, on_run))
+
+    async def scenario():
+        batcher = OCRBatcher(max_workers=1, max_batch_size=2)
+        await batcher.start()
+        jobs = [
+            asyncio.ensure_future(batcher.submit(path, page_num))
+            for page_num, path in enumerate(paths, start=1)
+        ]
+
+        # Pages 1-2 run; pages 3-4 wait on the executor; page 5 is still queued
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        stopping = asyncio.ensure_future(batcher.stop())
+        while not jobs[2].done():
+            await asyncio.sleep(0.001)
+        release.set()
+        await stopping
+
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        try:
+            await batcher.submit(paths[0], 1)
+        except RuntimeError as e:
+            results.append(e)
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert calls == [paths[:2]]
+    assert [page.page_number for page in results[:2]] == [1, 2]
+    assert _texts(results[:2]) == ["doc-1", "doc-2"]
+    for error in results[2:5]:
+        assert isinstance(error, RuntimeError)
+        assert str(error) == "OCR batcher stopped"
+    assert str(results[5]) == "OCR batcher is not running"
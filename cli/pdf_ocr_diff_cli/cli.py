@@ -1,16 +1,14 @@
 """Command-line interface for PDF OCR diff tool."""
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
-from pdf_ocr_diff.ocr import process_pdf
-from pdf_ocr_diff.differ import compare_pdfs
+import orjson
 
 
-def main():
-    """Main entry point for the CLI."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description='Compare two PDFs using OCR and generate a spatial diff.',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -19,6 +17,7 @@ Examples:
   pdf-ocr-diff doc_v1.pdf doc_v2.pdf
   pdf-ocr-diff doc_v1.pdf doc_v2.pdf --output diff.json
   pdf-ocr-diff doc_v1.pdf doc_v2.pdf --dpi 200
+  pdf-ocr-diff doc_v1.pdf doc_v2.pdf --workers 4
         '''
     )
     
@@ -34,12 +33,36 @@ Examples:
     parser.add_argument('--no-clean-stray-chars',
                        action='store_true',
                        help='Disable cleaning of stray trailing characters from OCR output')
+    parser.add_argument('--flat-bboxes',
+                       action='store_true',
+                       help='Emit bounding boxes as flat [x, y, width, height, ...] lists')
+    parser.add_argument('--no-unified-diff',
+                       action='store_true',
+                       help='Omit unified diff text from the output (faster for large documents)')
+    parser.add_argument('--workers',
+                       type=int,
+                       default=1,
+                       help='Workers used to OCR and compare pages in parallel (default: 1)')
     parser.add_argument('--line-height-tolerance',
                        type=int,
                        default=5,
                        help='Pixels of vertical tolerance for grouping words (deprecated, kept for compatibility)')
     
-    args = parser.parse_args()
+    return parser
+
+
+# Built once at import time and reused by main()
+_PARSER = _build_parser()
+
+
+def main():
+    """Main entry point for the CLI."""
+    args = _PARSER.parse_args()
+    
+    # Imported after argument parsing so --help and usage errors don't pay for
+    # loading the OCR stack (pytesseract, pdf2image, PIL, pandas)
+    from pdf_ocr_diff.ocr import process_pdf
+    from pdf_ocr_diff.differ import compare_pdfs, get_unified_diff
     
     # Validate input files
     pdf_a_path = Path(args.pdf_a)
@@ -59,28 +82,40 @@ Examples:
         
         # Process first PDF
         print(f"Processing {args.pdf_a}...", file=sys.stderr)
-        pages_a = process_pdf(str(pdf_a_path), dpi=args.dpi, clean_stray_chars=clean_stray_chars)
+        pages_a = process_pdf(str(pdf_a_path), dpi=args.dpi, clean_stray_chars=clean_stray_chars,
+                              max_workers=args.workers)
         print(f"  Extracted {len(pages_a)} pages", file=sys.stderr)
         
         # Process second PDF
         print(f"Processing {args.pdf_b}...", file=sys.stderr)
-        pages_b = process_pdf(str(pdf_b_path), dpi=args.dpi, clean_stray_chars=clean_stray_chars)
+        pages_b = process_pdf(str(pdf_b_path), dpi=args.dpi, clean_stray_chars=clean_stray_chars,
+                              max_workers=args.workers)
         print(f"  Extracted {len(pages_b)} pages", file=sys.stderr)
         
         # Compare PDFs
         print("Computing differences...", file=sys.stderr)
-        diff_result = compare_pdfs(pages_a, pages_b, args.pdf_a, args.pdf_b)
+        diff_result = compare_pdfs(pages_a, pages_b, args.pdf_a, args.pdf_b,
+                                   max_workers=args.workers)
         print(f"  Found {len(diff_result.diff_items)} differences", file=sys.stderr)
         
-        # Output results
-        result_json = json.dumps(diff_result.to_dict(), indent=2)
+        # Output results; unified diffs are only built when they are emitted
+        if not args.no_unified_diff:
+            for item in diff_result.diff_items:
+                get_unified_diff(item)
+        result_dict = diff_result.to_dict(
+            flat_bboxes=args.flat_bboxes,
+            include_unified_diff=not args.no_unified_diff
+        )
+        result_json = orjson.dumps(result_dict, option=orjson.OPT_INDENT_2)
         
         if args.output:
             output_path = Path(args.output)
-            output_path.write_text(result_json)
+            output_path.write_bytes(result_json)
             print(f"Results written to {args.output}", file=sys.stderr)
         else:
-            print(result_json)
+            sys.stdout.buffer.write(result_json)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.flush()
         
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
@@ -1,29 +1,213 @@
 """Diff computation module for comparing OCR results from two PDFs."""
 
 import difflib
-from difflib import SequenceMatcher
-from typing import List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence, Tuple
 import re
 
+try:
+    # Drop-in C implementation of SequenceMatcher (optional "fast" extra)
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
+try:
+    # Batched C++ similarity scoring (optional "fast" extra)
+    from rapidfuzz import fuzz, process as fuzz_process
+    from rapidfuzz.distance import Indel as indel
+except ImportError:
+    fuzz_process = None
+    indel = None
+
 from .models import PageData, DiffItem, DiffOperation, DiffResult, BoundingBox, CharDiff
 
+# Words (including punctuation attached to words) or runs of whitespace
+_TOKEN_RE = re.compile(r'\S+|\s+')
+
+# Operation strings produced by the matchers mapped to their enum members
+_OPERATIONS = {op.value: op for op in DiffOperation}
+
+# Merged items larger than this (in characters, per side) get no unified diff
+_UNIFIED_DIFF_MAX_CHARS = 50_000
+
 
-def _tokenize_text(text: str) -> List[Tuple[str, int, int]]:
+def _tokenize_text(text: str) -> Tuple[List[str], List[int]]:
     """
     Tokenize text into words and whitespace, preserving positions.
     
+    Tokens cover the text contiguously, so positions are returned as a single
+    list of offsets rather than per-token (start, end) pairs: token k spans
+    text[bounds[k]:bounds[k + 1]].
+    
     Args:
         text: Text to tokenize
     
     Returns:
-        List of (token, start_pos, end_pos) tuples
+        Tuple of (tokens, bounds) where bounds has len(tokens) + 1 entries
+        and ends with len(text)
+    """
+    tokens = _TOKEN_RE.findall(text)
+    return tokens, list(accumulate(map(len, tokens), initial=0))
+
+
+# (tag, i1, i2, j1, j2) in the shape returned by SequenceMatcher.get_opcodes()
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _lcs_matching_blocks(a: Sequence, b: Sequence) -> List[Tuple[int, int, int]]:
+    """
+    Find the canonical longest common subsequence of two sequences.
+    
+    Common leading and trailing elements are stripped, then the middle is
+    solved with Hyyrö's bit-parallel LCS: one Python int per element of b
+    holds a row of the LCS table as bit flags over a, so each row costs a
+    few big-integer operations. The traceback breaks ties between equally
+    long subsequences the same way rapidfuzz's Indel.opcodes does (skip an
+    element of a, then an element of b, before matching), so this and the
+    rapidfuzz backend produce identical alignments.
+    
+    Args:
+        a: First sequence
+        b: Second sequence
+    
+    Returns:
+        List of (i, j, size) matching blocks in increasing order, in the
+        format of SequenceMatcher.get_matching_blocks() without the sentinel
+    """
+    n, m = len(a), len(b)
+    
+    # Strip common prefix and suffix; only the middle needs the LCS table
+    prefix = 0
+    while prefix < n and prefix < m and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < n - prefix and suffix < m - prefix
+           and a[n - 1 - suffix] == b[m - 1 - suffix]):
+        suffix += 1
+    
+    mid_a = a[prefix:n - suffix]
+    mid_b = b[prefix:m - suffix]
+    
+    # Bit i of masks[x] is set where mid_a[i] == x
+    masks = {}
+    for i, element in enumerate(mid_a):
+        masks[element] = masks.get(element, 0) | (1 << i)
+    
+    # rows[j] describes the table after mid_b[:j + 1]: a clear bit i means
+    # the LCS grows by one when mid_a[i] is added
+    full = (1 << len(mid_a)) - 1
+    row = full
+    rows = []
+    for element in mid_b:
+        matched = row & masks.get(element, 0)
+        row = ((row + matched) | (row - matched)) & full
+        rows.append(row)
+    
+    # Walk back from the end of both sequences, collecting matched pairs
+    matches = []
+    x, y = len(mid_a), len(mid_b)
+    while x and y:
+        if (rows[y - 1] >> (x - 1)) & 1:
+            # mid_a[x - 1] is not needed for the LCS here: skip it
+            x -= 1
+        else:
+            y -= 1
+            if not y or (rows[y - 1] >> (x - 1)) & 1:
+                x -= 1
+                matches.append((prefix + x, prefix + y))
+            # Otherwise mid_b[y] is not needed for the LCS: skip it
+    matches.reverse()
+    
+    # Combine the stripped prefix/suffix with the matched pairs
+    candidates = [(0, 0, prefix)]
+    candidates.extend((i, j, 1) for i, j in matches)
+    candidates.append((n - suffix, m - suffix, suffix))
+    return _normalize_matching_blocks(a, b, candidates)
+
+
+def _normalize_matching_blocks(a: Sequence, b: Sequence,
+                               candidates: Sequence[Tuple[int, int, int]]) -> List[Tuple[int, int, int]]:
+    """
+    Merge adjacent matching blocks and move pure insertions/deletions right.
+    
+    Args:
+        a: First sequence
+        b: Second sequence
+        candidates: (i, j, size) matching blocks of a common subsequence in
+                    increasing order; zero-size blocks are ignored
+    
+    Returns:
+        Normalized list of (i, j, size) matching blocks
     """
-    tokens = []
-    # Pattern matches words (including punctuation attached to words) or whitespace
-    pattern = r'\S+|\s+'
-    for match in re.finditer(pattern, text):
-        tokens.append((match.group(), match.start(), match.end()))
-    return tokens
+    # Merge runs that touch end to end
+    blocks = []
+    for i, j, size in candidates:
+        if not size:
+            continue
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            blocks[-1][2] += size
+        else:
+            blocks.append([i, j, size])
+    
+    # The LCS traceback leaves pure insertions/deletions at the leftmost of
+    # several equally short placements ("is| not| Michael"); slide them right
+    # while the run stays equivalent so they start on the edited token
+    # ("is |not |Michael")
+    for idx in range(len(blocks) - 1):
+        cur, nxt = blocks[idx], blocks[idx + 1]
+        if cur[0] + cur[2] == nxt[0]:
+            seq, gap_start, nxt_start = b, cur[1] + cur[2], 1
+        elif cur[1] + cur[2] == nxt[1]:
+            seq, gap_start, nxt_start = a, cur[0] + cur[2], 0
+        else:
+            continue
+        while nxt[2] > 1 and seq[gap_start] == seq[nxt[nxt_start]]:
+            cur[2] += 1
+            gap_start += 1
+            nxt[0] += 1
+            nxt[1] += 1
+            nxt[2] -= 1
+    
+    return [(i, j, size) for i, j, size in blocks]
+
+
+def _lcs_opcodes(a: Sequence, b: Sequence) -> List[Opcode]:
+    """
+    Compute edit opcodes between two sequences from their canonical LCS.
+    
+    Gaps that lose elements from both sides are reported as 'replace', so the
+    result has the same shape as SequenceMatcher.get_opcodes(). Uses
+    rapidfuzz's Indel LCS when it is installed; the pure-Python fallback
+    picks the same subsequence, so the result doesn't depend on it.
+    
+    Args:
+        a: First sequence
+        b: Second sequence
+    
+    Returns:
+        List of (tag, i1, i2, j1, j2) opcodes covering both sequences
+    """
+    if indel is not None:
+        # rapidfuzz's bit-parallel LCS in C++; its matching blocks get the
+        # same normalization as ours
+        blocks = _normalize_matching_blocks(a, b, indel.opcodes(a, b).as_matching_blocks())
+    else:
+        blocks = _lcs_matching_blocks(a, b)
+    
+    opcodes = []
+    i = j = 0
+    for ai, bj, size in blocks + [(len(a), len(b), 0)]:
+        if i < ai and j < bj:
+            opcodes.append(('replace', i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(('delete', i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(('insert', i, ai, j, bj))
+        i, j = ai + size, bj + size
+        if size:
+            opcodes.append(('equal', ai, i, bj, j))
+    return opcodes
 
 
 def _compute_char_diffs(text_a: str, text_b: str) -> List[CharDiff]:
@@ -41,52 +225,38 @@ def _compute_char_diffs(text_a: str, text_b: str) -> List[CharDiff]:
     Returns:
         List of CharDiff objects showing word-level changes
     """
-    # Tokenize both texts
-    tokens_a = _tokenize_text(text_a)
-    tokens_b = _tokenize_text(text_b)
+    # Identical inputs need no matcher; empty strings have no tokens to report
+    if text_a == text_b:
+        if not text_a:
+            return []
+        return [CharDiff(
+            operation='equal',
+            text_a=text_a,
+            text_b=text_b,
+            start_a=0,
+            end_a=len(text_a),
+            start_b=0,
+            end_b=len(text_b)
+        )]
     
-    # Extract just the token strings for comparison
-    words_a = [token for token, _, _ in tokens_a]
-    words_b = [token for token, _, _ in tokens_b]
-    
-    # Run diff on tokens
-    matcher = SequenceMatcher(None, words_a, words_b)
-    char_diffs = []
+    # Tokenize both texts
+    words_a, bounds_a = _tokenize_text(text_a)
+    words_b, bounds_b = _tokenize_text(text_b)
     
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
-        # Get the actual text and positions for these token ranges
-        if i1 < i2:
-            # Tokens exist in text_a
-            start_a = tokens_a[i1][1]
-            end_a = tokens_a[i2 - 1][2]
-            text_a_segment = text_a[start_a:end_a]
-        else:
-            start_a = tokens_a[i1][1] if i1 < len(tokens_a) else len(text_a)
-            end_a = start_a
-            text_a_segment = None
-        
-        if j1 < j2:
-            # Tokens exist in text_b
-            start_b = tokens_b[j1][1]
-            end_b = tokens_b[j2 - 1][2]
-            text_b_segment = text_b[start_b:end_b]
-        else:
-            start_b = tokens_b[j1][1] if j1 < len(tokens_b) else len(text_b)
-            end_b = start_b
-            text_b_segment = None
-        
-        char_diff = CharDiff(
+    # Diff the tokens (only the changed middle of mostly-equal lines is
+    # searched) and map each token range back to its character range
+    return [
+        CharDiff(
             operation=tag,
-            text_a=text_a_segment,
-            text_b=text_b_segment,
-            start_a=start_a,
-            end_a=end_a,
-            start_b=start_b,
-            end_b=end_b
+            text_a=text_a[bounds_a[i1]:bounds_a[i2]] if i1 < i2 else None,
+            text_b=text_b[bounds_b[j1]:bounds_b[j2]] if j1 < j2 else None,
+            start_a=bounds_a[i1],
+            end_a=bounds_a[i2],
+            start_b=bounds_b[j1],
+            end_b=bounds_b[j2]
         )
-        char_diffs.append(char_diff)
-    
-    return char_diffs
+        for tag, i1, i2, j1, j2 in _lcs_opcodes(words_a, words_b)
+    ]
 
 
 def _infer_operation_from_char_diffs(char_diffs: List[CharDiff]) -> str:
@@ -108,30 +278,31 @@ def _infer_operation_from_char_diffs(char_diffs: List[CharDiff]) -> str:
     """
     has_insert = False
     has_delete = False
-    has_replace = False
     
+    # Any replace operation, or both an insert and a delete, makes the whole
+    # change a replace; return as soon as either is seen
     for diff in char_diffs:
-        if diff.operation == 'equal':
+        operation = diff.operation
+        if operation == 'equal':
             continue
-        elif diff.operation == 'insert':
+        elif operation == 'insert':
+            if has_delete:
+                return 'replace'
             has_insert = True
-        elif diff.operation == 'delete':
+        elif operation == 'delete':
+            if has_insert:
+                return 'replace'
             has_delete = True
-        elif diff.operation == 'replace':
-            # Check if this is a whitespace-only replace (e.g., newline <-> space)
-            text_a_ws = diff.text_a and diff.text_a.strip() == ''
-            text_b_ws = diff.text_b and diff.text_b.strip() == ''
-            
-            if text_a_ws and text_b_ws:
-                # Both sides are whitespace - ignore this replace for classification
-                continue
-            else:
-                has_replace = True
-    
-    # If there's any replace operation, or both insert and delete, it's a replace
-    if has_replace or (has_insert and has_delete):
-        return 'replace'
-    elif has_insert:
+        elif operation == 'replace':
+            # Whitespace-only replaces (e.g., newline <-> space) are formatting
+            # changes and don't count; the text_b check only runs when text_a
+            # is whitespace. isspace() matches strip()'s notion of whitespace
+            # without building a stripped copy.
+            if not (diff.text_a and diff.text_a.isspace() and
+                    diff.text_b and diff.text_b.isspace()):
+                return 'replace'
+    
+    if has_insert:
         return 'insert'
     elif has_delete:
         return 'delete'
@@ -153,6 +324,10 @@ def _generate_unified_diff(text_a: str, text_b: str, label_a: str = "a", label_b
     Returns:
         Unified diff string
     """
+    # Identical inputs produce no hunks
+    if text_a == text_b:
+        return ""
+    
     # Split into lines for unified_diff (though we're often comparing single lines)
     lines_a = text_a.splitlines(keepends=True)
     lines_b = text_b.splitlines(keepends=True)
@@ -163,16 +338,19 @@ def _generate_unified_diff(text_a: str, text_b: str, label_a: str = "a", label_b
     if lines_b and not lines_b[-1].endswith('\n'):
         lines_b[-1] += '\n'
     
-    # Generate unified diff
-    diff_lines = list(difflib.unified_diff(
+    # Two differing single lines (the paired-line case) always produce the
+    # same one-hunk diff; format it directly instead of running a line diff
+    if len(lines_a) == 1 and len(lines_b) == 1 and lines_a[0] != lines_b[0]:
+        return f"--- {label_a}\n+++ {label_b}\n@@ -1 +1 @@\n-{lines_a[0]}\n+{lines_b[0]}"
+    
+    # Generate unified diff, joining lines straight from the generator
+    return '\n'.join(difflib.unified_diff(
         lines_a,
         lines_b,
         fromfile=label_a,
         tofile=label_b,
         lineterm=''
     ))
-    
-    return '\n'.join(diff_lines)
 
 
 def _find_best_match(line: str, candidates: List[str], threshold: float = 0.6) -> Optional[int]:
@@ -187,11 +365,34 @@ def _find_best_match(line: str, candidates: List[str], threshold: float = 0.6) -
     Returns:
         Index of best match, or None if no good match found
     """
+    if fuzz_process is not None:
+        # Score every candidate in a single call; fuzz.ratio is the normalized
+        # Indel similarity on a 0-100 scale
+        result = fuzz_process.extractOne(
+            line, candidates, scorer=fuzz.ratio, score_cutoff=threshold * 100
+        )
+        if result is None or result[1] == 0:
+            return None
+        return result[2]
+    
     best_ratio = 0.0
     best_idx = None
     
+    # SequenceMatcher caches its analysis of the second sequence, so fix the
+    # line there and swap candidates in as the first sequence
+    matcher = SequenceMatcher(None, autojunk=False)
+    matcher.set_seq2(line)
+    
     for idx, candidate in enumerate(candidates):
-        ratio = SequenceMatcher(None, line, candidate).ratio()
+        matcher.set_seq1(candidate)
+        # Cheap upper bounds rule out most candidates before the full ratio
+        upper = matcher.real_quick_ratio()
+        if upper < threshold or upper <= best_ratio:
+            continue
+        upper = matcher.quick_ratio()
+        if upper < threshold or upper <= best_ratio:
+            continue
+        ratio = matcher.ratio()
         if ratio > best_ratio:
             best_ratio = ratio
             best_idx = idx
@@ -199,6 +400,28 @@ def _find_best_match(line: str, candidates: List[str], threshold: float = 0.6) -
     return best_idx if best_ratio >= threshold else None
 
 
+def get_unified_diff(item: DiffItem) -> Optional[str]:
+    """
+    Return an item's unified diff, building it from its labels if needed.
+    
+    compare_pages and _merge_diff_items only record the (from, to) labels,
+    so the second diff pass is paid only for items whose diff is actually
+    read. The result is stored on the item's unified_diff field.
+    
+    Args:
+        item: Diff item to build the unified diff for
+    
+    Returns:
+        Unified diff string, or None when the item has no labels or is
+        missing text on either side
+    """
+    if (item.unified_diff is None and item.unified_diff_labels is not None
+            and item.text_a and item.text_b):
+        item.unified_diff = _generate_unified_diff(item.text_a, item.text_b,
+                                                   *item.unified_diff_labels)
+    return item.unified_diff
+
+
 def _group_consecutive_diffs(diff_items: List[DiffItem], max_y_gap: int = 100, max_x_gap: int = 200) -> List[DiffItem]:
     """
     Group consecutive diff items that are spatially close.
@@ -219,59 +442,48 @@ def _group_consecutive_diffs(diff_items: List[DiffItem], max_y_gap: int = 100, m
     if not diff_items:
         return []
     
-    grouped = []
-    current_group = [diff_items[0]]
+    # Find the indices where a new group starts, then slice groups out in
+    # one pass instead of appending items to a running group
+    starts = [0]
+    prev = diff_items[0]
     
-    for item in diff_items[1:]:
-        prev_item = current_group[-1]
-        
-        # Check if items can be grouped based on spatial proximity and page numbers
-        # Note: We now allow different operation types to be grouped
-        can_group = (item.page_a == prev_item.page_a and
-                    item.page_b == prev_item.page_b)
+    for index in range(1, len(diff_items)):
+        item = diff_items[index]
+        # Items can only be grouped within the same page pair; check that
+        # before touching any bounding boxes
+        can_group = item.page_a == prev.page_a and item.page_b == prev.page_b
         
-        # Check spatial proximity
         if can_group:
-            # Try to get bounding boxes from either side (prefer the side that has data)
-            prev_bbox = None
-            curr_bbox = None
+            # Compare the previous item's last box with this item's first box,
+            # preferring side A and falling back to side B when A is missing
+            prev_boxes, curr_boxes = prev.bounding_boxes_a, item.bounding_boxes_a
+            if not (prev_boxes and curr_boxes):
+                prev_boxes, curr_boxes = prev.bounding_boxes_b, item.bounding_boxes_b
             
-            if prev_item.bounding_boxes_a and item.bounding_boxes_a:
-                prev_bbox = prev_item.bounding_boxes_a[-1]
-                curr_bbox = item.bounding_boxes_a[0]
-            elif prev_item.bounding_boxes_b and item.bounding_boxes_b:
-                prev_bbox = prev_item.bounding_boxes_b[-1]
-                curr_bbox = item.bounding_boxes_b[0]
-            
-            if prev_bbox and curr_bbox:
-                # Check vertical distance
-                if abs(curr_bbox.y - prev_bbox.y) > max_y_gap:
-                    can_group = False
-                # Check horizontal alignment (are they in the same column?)
-                elif abs(curr_bbox.x - prev_bbox.x) > max_x_gap:
-                    can_group = False
+            if prev_boxes and curr_boxes:
+                prev_bbox, curr_bbox = prev_boxes[-1], curr_boxes[0]
+                dy = curr_bbox.y - prev_bbox.y
+                dx = curr_bbox.x - prev_bbox.x
+                # Check vertical distance and horizontal alignment (same column)
+                can_group = (-max_y_gap <= dy <= max_y_gap and
+                             -max_x_gap <= dx <= max_x_gap)
             else:
                 # Can't determine spatial relationship, don't group
                 can_group = False
         
-        if can_group:
-            current_group.append(item)
-        else:
-            # Flush current group
-            if len(current_group) > 1:
-                # Merge group into single item with re-analyzed operation
-                grouped.append(_merge_diff_items(current_group))
-            else:
-                grouped.append(current_group[0])
-            current_group = [item]
-    
-    # Flush last group
-    if len(current_group) > 1:
-        grouped.append(_merge_diff_items(current_group))
-    else:
-        grouped.append(current_group[0])
-    
-    return grouped
+        if not can_group:
+            starts.append(index)
+        prev = item
+    
+    if len(starts) == len(diff_items):
+        # Nothing grouped; every item stands alone
+        return list(diff_items)
+    
+    starts.append(len(diff_items))
+    return [
+        diff_items[lo] if hi - lo == 1 else _merge_diff_items(diff_items[lo:hi])
+        for lo, hi in zip(starts, starts[1:])
+    ]
 
 
 def _merge_diff_items(items: List[DiffItem]) -> DiffItem:
@@ -297,22 +509,24 @@ def _merge_diff_items(items: List[DiffItem]) -> DiffItem:
     merged_text_a = '\n'.join(texts_a) if texts_a else None
     merged_text_b = '\n'.join(texts_b) if texts_b else None
     
-    # Generate unified diff and char diffs for merged text
-    unified_diff = None
+    # Unified diff labels (the diff itself is built lazily) and char diffs
+    unified_diff_labels = None
     char_diffs = []
     operation = items[0].operation  # Default to first item's operation
     
     if merged_text_a and merged_text_b:
-        unified_diff = _generate_unified_diff(
-            merged_text_a, merged_text_b,
-            f"page_{items[0].page_a}",
-            f"page_{items[0].page_b}"
-        )
-        char_diffs = _compute_char_diffs(merged_text_a, merged_text_b)
+        # The unified diff is a secondary view of the change; skip it when
+        # there is nothing to show or the merged text is too large to be useful
+        if (merged_text_a != merged_text_b and
+                max(len(merged_text_a), len(merged_text_b)) <= _UNIFIED_DIFF_MAX_CHARS):
+            unified_diff_labels = (f"page_{items[0].page_a}", f"page_{items[0].page_b}")
+        char_diffs = _splice_char_diffs(items, merged_text_a, merged_text_b)
+        if char_diffs is None:
+            char_diffs = _compute_char_diffs(merged_text_a, merged_text_b)
         
         # Re-infer operation type from combined word-level diffs
         inferred_op = _infer_operation_from_char_diffs(char_diffs)
-        operation = getattr(DiffOperation, inferred_op.upper())
+        operation = _OPERATIONS[inferred_op]
     elif merged_text_a and not merged_text_b:
         # Only text_a exists - this is a delete
         operation = DiffOperation.DELETE
@@ -328,11 +542,112 @@ def _merge_diff_items(items: List[DiffItem]) -> DiffItem:
         text_b=merged_text_b,
         bounding_boxes_a=bboxes_a,
         bounding_boxes_b=bboxes_b,
-        unified_diff=unified_diff,
+        unified_diff_labels=unified_diff_labels,
         char_diffs=char_diffs
     )
 
 
+def _splice_char_diffs(items: List[DiffItem], merged_text_a: str,
+                       merged_text_b: str) -> Optional[List[CharDiff]]:
+    """
+    Combine the per-line word diffs of merged items without rediffing.
+    
+    Rediffing the joined text costs far more than the per-line diffs did, so
+    when every item is a paired line whose diff only has equal and replace
+    operations, its diffs are shifted into the merged text and joined by an
+    equal newline. Any insert or delete may be text reflowing across lines,
+    which only a diff of the joined text can recognize, so those groups (and
+    groups with unpaired items) are left to the caller.
+    
+    Args:
+        items: Diff items being merged, in order
+        merged_text_a: Newline-joined text_a of the items
+        merged_text_b: Newline-joined text_b of the items
+    
+    Returns:
+        Word-level diffs of merged_text_a against merged_text_b, or None if
+        the items can't be spliced
+    """
+    # (operation, start_a, end_a, start_b, end_b) spans in merged coordinates
+    spans = []
+    offset_a = offset_b = 0
+    
+    for item in items:
+        if not (item.text_a and item.text_b and item.char_diffs):
+            return None
+        line_spans = [
+            (diff.operation, diff.start_a + offset_a, diff.end_a + offset_a,
+             diff.start_b + offset_b, diff.end_b + offset_b)
+            for diff in item.char_diffs
+        ]
+        if spans:
+            # The newline joining two lines is unchanged on both sides
+            line_spans.insert(0, ('equal', offset_a - 1, offset_a, offset_b - 1, offset_b))
+        for operation, start_a, end_a, start_b, end_b in line_spans:
+            if operation == 'insert' or operation == 'delete':
+                return None
+            if operation == 'equal' and spans and spans[-1][0] == 'equal':
+                # Extend the previous equal run across the line boundary
+                spans[-1][2] = end_a
+                spans[-1][4] = end_b
+            else:
+                spans.append([operation, start_a, end_a, start_b, end_b])
+        offset_a += len(item.text_a) + 1
+        offset_b += len(item.text_b) + 1
+    
+    return [
+        CharDiff(
+            operation=operation,
+            text_a=merged_text_a[start_a:end_a] if start_a < end_a else None,
+            text_b=merged_text_b[start_b:end_b] if start_b < end_b else None,
+            start_a=start_a,
+            end_a=end_a,
+            start_b=start_b,
+            end_b=end_b
+        )
+        for operation, start_a, end_a, start_b, end_b in spans
+    ]
+
+
+def _line_opcodes(lines_a: Sequence[str], lines_b: Sequence[str]) -> List[Opcode]:
+    """
+    Compute line-level opcodes between two pages.
+    
+    Unchanged leading and trailing lines (headers, footers, boilerplate) are
+    stripped before running SequenceMatcher, so it only indexes and searches
+    the region that actually changed. The stripped lines are equal and
+    produce no opcodes; returned indices refer to the full sequences.
+    
+    Args:
+        lines_a: Lines of the first page
+        lines_b: Lines of the second page
+    
+    Returns:
+        List of (tag, i1, i2, j1, j2) opcodes for the changed region
+    """
+    len_a, len_b = len(lines_a), len(lines_b)
+    
+    prefix = 0
+    while prefix < len_a and prefix < len_b and lines_a[prefix] == lines_b[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < len_a - prefix and suffix < len_b - prefix
+           and lines_a[len_a - 1 - suffix] == lines_b[len_b - 1 - suffix]):
+        suffix += 1
+    
+    # Use autojunk=False for more accurate matching
+    matcher = SequenceMatcher(
+        None,
+        lines_a[prefix:len_a - suffix],
+        lines_b[prefix:len_b - suffix],
+        autojunk=False
+    )
+    return [
+        (tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+    ]
+
+
 def compare_pages(page_a: Optional[PageData], page_b: Optional[PageData]) -> List[DiffItem]:
     """
     Compare two pages and generate diff items.
@@ -352,8 +667,8 @@ def compare_pages(page_a: Optional[PageData], page_b: Optional[PageData]) -> Lis
     
     if page_a is None:
         # Page only exists in B (insert)
-        for block in page_b.text_blocks:
-            diff_items.append(DiffItem(
+        return [
+            DiffItem(
                 operation=DiffOperation.INSERT,
                 page_a=None,
                 page_b=page_b.page_number,
@@ -361,13 +676,14 @@ def compare_pages(page_a: Optional[PageData], page_b: Optional[PageData]) -> Lis
                 text_b=block.text,
                 bounding_boxes_a=[],
                 bounding_boxes_b=[block.bounding_box]
-            ))
-        return diff_items
+            )
+            for block in page_b.text_blocks
+        ]
     
     if page_b is None:
         # Page only exists in A (delete)
-        for block in page_a.text_blocks:
-            diff_items.append(DiffItem(
+        return [
+            DiffItem(
                 operation=DiffOperation.DELETE,
                 page_a=page_a.page_number,
                 page_b=None,
@@ -375,44 +691,58 @@ def compare_pages(page_a: Optional[PageData], page_b: Optional[PageData]) -> Lis
                 text_b=None,
                 bounding_boxes_a=[block.bounding_box],
                 bounding_boxes_b=[]
-            ))
-        return diff_items
+            )
+            for block in page_a.text_blocks
+        ]
     
     # Both pages exist - compare line by line
-    lines_a = [block.text for block in page_a.text_blocks]
-    lines_b = [block.text for block in page_b.text_blocks]
-    
-    # Use autojunk=False for more accurate matching
-    matcher = SequenceMatcher(None, lines_a, lines_b, autojunk=False)
+    lines_a = page_a.texts
+    lines_b = page_b.texts
+    bboxes_a = page_a.bboxes
+    bboxes_b = page_b.bboxes
+    # Bound once for the opcode loop, which builds one DiffItem per changed line
+    page_num_a = page_a.page_number
+    page_num_b = page_b.page_number
+    delete_op = DiffOperation.DELETE
+    insert_op = DiffOperation.INSERT
+    
+    # Unchanged page: nothing to diff. Lines are interned, so this is mostly
+    # identity checks and bails out on the first differing line or length.
+    if lines_a == lines_b:
+        return diff_items
     
-    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+    for tag, i1, i2, j1, j2 in _line_opcodes(lines_a, lines_b):
         if tag == 'equal':
             # Lines are the same - skip (we only track differences)
             continue
         elif tag == 'delete':
             # Lines only in A - create one diff item per line
-            for i in range(i1, i2):
-                diff_items.append(DiffItem(
-                    operation=DiffOperation.DELETE,
-                    page_a=page_a.page_number,
-                    page_b=page_b.page_number,
+            diff_items.extend(
+                DiffItem(
+                    operation=delete_op,
+                    page_a=page_num_a,
+                    page_b=page_num_b,
                     text_a=lines_a[i],
                     text_b=None,
-                    bounding_boxes_a=[page_a.text_blocks[i].bounding_box],
+                    bounding_boxes_a=[bboxes_a[i]],
                     bounding_boxes_b=[]
-                ))
+                )
+                for i in range(i1, i2)
+            )
         elif tag == 'insert':
             # Lines only in B - create one diff item per line
-            for j in range(j1, j2):
-                diff_items.append(DiffItem(
-                    operation=DiffOperation.INSERT,
-                    page_a=page_a.page_number,
-                    page_b=page_b.page_number,
+            diff_items.extend(
+                DiffItem(
+                    operation=insert_op,
+                    page_a=page_num_a,
+                    page_b=page_num_b,
                     text_a=None,
                     text_b=lines_b[j],
                     bounding_boxes_a=[],
-                    bounding_boxes_b=[page_b.text_blocks[j].bounding_box]
-                ))
+                    bounding_boxes_b=[bboxes_b[j]]
+                )
+                for j in range(j1, j2)
+            )
         elif tag == 'replace':
             # Lines differ between A and B
             # For equal-length replacements, pair them up line-by-line
@@ -426,56 +756,55 @@ def compare_pages(page_a: Optional[PageData], page_b: Optional[PageData]) -> Lis
                 i = i1 + idx
                 j = j1 + idx
                 
-                # Generate unified diff for this line pair
-                unified_diff = _generate_unified_diff(
-                    lines_a[i],
-                    lines_b[j],
-                    f"page_{page_a.page_number}_line_{i}",
-                    f"page_{page_b.page_number}_line_{j}"
-                )
-                
                 # Compute word-level diffs
                 char_diffs = _compute_char_diffs(lines_a[i], lines_b[j])
                 
                 # Infer the actual operation type from word-level diffs
                 inferred_op = _infer_operation_from_char_diffs(char_diffs)
-                operation = getattr(DiffOperation, inferred_op.upper())
+                operation = _OPERATIONS[inferred_op]
                 
                 diff_items.append(DiffItem(
                     operation=operation,
-                    page_a=page_a.page_number,
-                    page_b=page_b.page_number,
+                    page_a=page_num_a,
+                    page_b=page_num_b,
                     text_a=lines_a[i],
                     text_b=lines_b[j],
-                    bounding_boxes_a=[page_a.text_blocks[i].bounding_box],
-                    bounding_boxes_b=[page_b.text_blocks[j].bounding_box],
-                    unified_diff=unified_diff,
+                    bounding_boxes_a=[bboxes_a[i]],
+                    bounding_boxes_b=[bboxes_b[j]],
+                    unified_diff_labels=(
+                        f"page_{page_num_a}_line_{i}",
+                        f"page_{page_num_b}_line_{j}"
+                    ),
                     char_diffs=char_diffs
                 ))
             
             # Handle extra lines in A (deletions)
-            for i in range(i1 + min_lines, i2):
-                diff_items.append(DiffItem(
-                    operation=DiffOperation.DELETE,
-                    page_a=page_a.page_number,
-                    page_b=page_b.page_number,
+            diff_items.extend(
+                DiffItem(
+                    operation=delete_op,
+                    page_a=page_num_a,
+                    page_b=page_num_b,
                     text_a=lines_a[i],
                     text_b=None,
-                    bounding_boxes_a=[page_a.text_blocks[i].bounding_box],
+                    bounding_boxes_a=[bboxes_a[i]],
                     bounding_boxes_b=[]
-                ))
+                )
+                for i in range(i1 + min_lines, i2)
+            )
             
             # Handle extra lines in B (insertions)
-            for j in range(j1 + min_lines, j2):
-                diff_items.append(DiffItem(
-                    operation=DiffOperation.INSERT,
-                    page_a=page_a.page_number,
-                    page_b=page_b.page_number,
+            diff_items.extend(
+                DiffItem(
+                    operation=insert_op,
+                    page_a=page_num_a,
+                    page_b=page_num_b,
                     text_a=None,
                     text_b=lines_b[j],
                     bounding_boxes_a=[],
-                    bounding_boxes_b=[page_b.text_blocks[j].bounding_box]
-                ))
+                    bounding_boxes_b=[bboxes_b[j]]
+                )
+                for j in range(j1 + min_lines, j2)
+            )
     
     # Group consecutive diffs that are spatially close
     diff_items = _group_consecutive_diffs(diff_items)
@@ -483,8 +812,51 @@ def compare_pages(page_a: Optional[PageData], page_b: Optional[PageData]) -> Lis
     return diff_items
 
 
+def _compare_page_pair(pair: Tuple[Optional[PageData], Optional[PageData]]) -> List[DiffItem]:
+    """Compare one (page_a, page_b) pair; module-level so worker processes can unpickle it."""
+    return compare_pages(*pair)
+
+
+def iter_compare_pdfs(pages_a: List[PageData], pages_b: List[PageData],
+                      max_workers: Optional[int] = None) -> Iterator[DiffItem]:
+    """
+    Compare two PDFs page by page, yielding diff items as each page finishes.
+    
+    Items are yielded in page order. Only one page's items are held at a time
+    (when comparing serially), so callers that process items incrementally
+    don't have to keep every difference of a large document in memory.
+    
+    Args:
+        pages_a: List of PageData from first PDF
+        pages_b: List of PageData from second PDF
+        max_workers: Number of worker processes used to compare pages in
+                     parallel. None or 1 compares pages in this process.
+    
+    Yields:
+        DiffItem objects for each page in turn
+    """
+    # Pair pages up to the length of the longer PDF, padding with None
+    max_pages = max(len(pages_a), len(pages_b))
+    pairs = [
+        (pages_a[page_num] if page_num < len(pages_a) else None,
+         pages_b[page_num] if page_num < len(pages_b) else None)
+        for page_num in range(max_pages)
+    ]
+    
+    if max_workers is not None and max_workers > 1 and len(pairs) > 1:
+        # Pages are independent and comparison is CPU-bound pure Python,
+        # so spread them across processes to sidestep the GIL
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            for diffs in executor.map(_compare_page_pair, pairs, chunksize=4):
+                yield from diffs
+    else:
+        for pair in pairs:
+            yield from _compare_page_pair(pair)
+
+
 def compare_pdfs(pages_a: List[PageData], pages_b: List[PageData], 
-                 pdf_a_path: str, pdf_b_path: str) -> DiffResult:
+                 pdf_a_path: str, pdf_b_path: str,
+                 max_workers: Optional[int] = None) -> DiffResult:
     """
     Compare two PDFs page by page and generate a complete diff result.
     
@@ -493,26 +865,16 @@ def compare_pdfs(pages_a: List[PageData], pages_b: List[PageData],
         pages_b: List of PageData from second PDF
         pdf_a_path: Path to first PDF
         pdf_b_path: Path to second PDF
+        max_workers: Number of worker processes used to compare pages in
+                     parallel. None or 1 compares pages in this process.
     
     Returns:
         DiffResult containing all differences
     """
-    all_diff_items = []
-    
-    # Compare pages up to the length of the shorter PDF
-    max_pages = max(len(pages_a), len(pages_b))
-    
-    for page_num in range(max_pages):
-        page_a = pages_a[page_num] if page_num < len(pages_a) else None
-        page_b = pages_b[page_num] if page_num < len(pages_b) else None
-        
-        page_diffs = compare_pages(page_a, page_b)
-        all_diff_items.extend(page_diffs)
-    
     return DiffResult(
         pdf_a_path=pdf_a_path,
         pdf_b_path=pdf_b_path,
         total_pages_a=len(pages_a),
         total_pages_b=len(pages_b),
-        diff_items=all_diff_items
+        diff_items=list(iter_compare_pdfs(pages_a, pages_b, max_workers))
     )
@@ -1,10 +1,17 @@
 """Data models for PDF OCR diff operations."""
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional
+from functools import cached_property
+from typing import Iterable, List, Optional, Tuple
 from enum import Enum
 
 
+# Small, high-volume models use __slots__ where dataclasses support it (3.10+)
+# to drop the per-instance __dict__.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class DiffOperation(Enum):
     """Types of diff operations."""
     EQUAL = "equal"
@@ -13,7 +20,11 @@ class DiffOperation(Enum):
     REPLACE = "replace"
 
 
-@dataclass
+# Interned operation strings, looked up once per DiffItem during serialization
+_OP_VALUES = {op: sys.intern(op.value) for op in DiffOperation}
+
+
+@dataclass(**_SLOTS)
 class BoundingBox:
     """Represents a rectangular region on a page."""
     x: int
@@ -30,8 +41,20 @@ class BoundingBox:
             "height": self.height
         }
 
+    @classmethod
+    def pack_many(cls, boxes: Iterable["BoundingBox"]) -> List[int]:
+        """
+        Pack bounding boxes into a flat [x0, y0, w0, h0, x1, y1, ...] list.
+        
+        A compact alternative to a list of per-box dicts for JSON output.
+        """
+        packed = []
+        for box in boxes:
+            packed.extend((box.x, box.y, box.width, box.height))
+        return packed
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class TextBlock:
     """Represents a block of text with its location on a page."""
     text: str
@@ -55,6 +78,28 @@ class PageData:
     image_width: int = 0
     image_height: int = 0
 
+    @cached_property
+    def texts(self) -> Tuple[str, ...]:
+        """
+        Text of each block, in order.
+        
+        Computed on first access and cached on the instance, so repeated
+        comparisons of the same page don't rebuild it. Treat text_blocks as
+        read-only once this has been accessed.
+        
+        Strings are interned, so lines repeated within and across pages
+        (headers, footers, blank separators) share one object and compare
+        by identity when the line matcher probes its index.
+        """
+        return tuple(sys.intern(block.text) for block in self.text_blocks)
+
+    @cached_property
+    def bboxes(self) -> Tuple[BoundingBox, ...]:
+        """
+        Bounding box of each block, in order (cached like texts).
+        """
+        return tuple(block.bounding_box for block in self.text_blocks)
+
     def to_dict(self):
         """Convert to dictionary for JSON serialization."""
         return {
@@ -65,7 +110,7 @@ class PageData:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class CharDiff:
     """Represents character-level differences within text."""
     operation: str  # 'equal', 'delete', 'insert', 'replace'
@@ -100,19 +145,35 @@ class DiffItem:
     bounding_boxes_b: List[BoundingBox] = field(default_factory=list)
     unified_diff: Optional[str] = None  # Unified diff format
     char_diffs: List[CharDiff] = field(default_factory=list)  # Character-level changes
-
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization."""
+    # (from, to) labels for building unified_diff on demand; see differ.get_unified_diff
+    unified_diff_labels: Optional[Tuple[str, str]] = None
+
+    def to_dict(self, flat_bboxes: bool = False, include_unified_diff: bool = True):
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Args:
+            flat_bboxes: Emit bounding boxes as flat [x, y, width, height, ...]
+                         lists under bounding_boxes_a_flat/bounding_boxes_b_flat
+                         instead of lists of dicts
+            include_unified_diff: Include the unified diff, if one is set
+        """
         result = {
-            "operation": self.operation.value,
+            "operation": _OP_VALUES[self.operation],
             "page_a": self.page_a,
             "page_b": self.page_b,
             "text_a": self.text_a,
             "text_b": self.text_b,
-            "bounding_boxes_a": [bbox.to_dict() for bbox in self.bounding_boxes_a],
-            "bounding_boxes_b": [bbox.to_dict() for bbox in self.bounding_boxes_b]
         }
-        if self.unified_diff:
+        if flat_bboxes:
+            result["bounding_boxes_a_flat"] = BoundingBox.pack_many(self.bounding_boxes_a)
+            result["bounding_boxes_b_flat"] = BoundingBox.pack_many(self.bounding_boxes_b)
+        else:
+            # Insert/delete items leave one side empty; skip the comprehension
+            boxes_a, boxes_b = self.bounding_boxes_a, self.bounding_boxes_b
+            result["bounding_boxes_a"] = [bbox.to_dict() for bbox in boxes_a] if boxes_a else []
+            result["bounding_boxes_b"] = [bbox.to_dict() for bbox in boxes_b] if boxes_b else []
+        if include_unified_diff and self.unified_diff:
             result["unified_diff"] = self.unified_diff
         if self.char_diffs:
             result["char_diffs"] = [cd.to_dict() for cd in self.char_diffs]
@@ -128,13 +189,22 @@ class DiffResult:
     total_pages_b: int
     diff_items: List[DiffItem]
 
-    def to_dict(self):
-        """Convert to dictionary for JSON serialization."""
+    def to_dict(self, flat_bboxes: bool = False, include_unified_diff: bool = True):
+        """
+        Convert to dictionary for JSON serialization.
+        
+        Args:
+            flat_bboxes: Emit bounding boxes as flat lists (see DiffItem.to_dict)
+            include_unified_diff: Include per-item unified diffs (see DiffItem.to_dict)
+        """
         return {
             "pdf_a_path": self.pdf_a_path,
             "pdf_b_path": self.pdf_b_path,
             "total_pages_a": self.total_pages_a,
             "total_pages_b": self.total_pages_b,
             "total_differences": len(self.diff_items),
-            "diff_items": [item.to_dict() for item in self.diff_items]
+            "diff_items": [
+                item.to_dict(flat_bboxes=flat_bboxes, include_unified_diff=include_unified_diff)
+                for item in self.diff_items
+            ]
         }
@@ -1,16 +1,27 @@
 """OCR processing module for extracting text with spatial data from PDFs."""
 
+import os
+import tempfile
 import pytesseract
+from pytesseract.pytesseract import file_to_dict, run_tesseract
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pdf2image import convert_from_path
 from PIL import Image
-from typing import List
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+import numpy as np
+import operator
 import pandas as pd
 import re
 
 from .models import PageData, TextBlock, BoundingBox
 
+# Line ending in a space plus a single letter, e.g. "Vanilla e"
+_STRAY_TAIL_RE = re.compile(r'.+ [a-zA-Z]\Z')
 
-def group_words_into_lines(ocr_data: pd.DataFrame, line_height_tolerance: int = 5) -> List[TextBlock]:
+
+def group_words_into_lines(ocr_data: Union[Mapping[str, Sequence], pd.DataFrame],
+                           line_height_tolerance: int = 5) -> List[TextBlock]:
     """
     Group word-level OCR results into lines using Tesseract's native line detection.
     
@@ -21,34 +32,54 @@ def group_words_into_lines(ocr_data: pd.DataFrame, line_height_tolerance: int =
     Falls back to coordinate-based grouping if Tesseract metadata is not available.
     
     Args:
-        ocr_data: DataFrame from pytesseract.image_to_data
+        ocr_data: Output of pytesseract.image_to_data, either Output.DICT (a dict
+                  of column lists) or Output.DATAFRAME
         line_height_tolerance: Pixels of vertical tolerance for fallback coordinate-based grouping
     
     Returns:
         List of TextBlock objects representing lines of text
     """
-    # Handle empty DataFrame
-    if ocr_data.empty:
-        return []
+    columns = ocr_data.to_dict('list') if isinstance(ocr_data, pd.DataFrame) else ocr_data
     
-    # Filter out empty text and confidence -1 (non-text blocks)
-    valid_data = ocr_data[(ocr_data['conf'] != -1) & (ocr_data['text'].astype(str).str.strip() != '')]
+    # Handle empty OCR output
+    texts = columns.get('text')
+    if not texts:
+        return []
     
-    if valid_data.empty:
+    # Filter out confidence -1 (non-text blocks) and empty text, stripping
+    # only the text of rows that pass the confidence check
+    valid = []
+    valid_texts = []
+    for i, (conf, text) in enumerate(zip(columns['conf'], texts)):
+        if conf != -1:
+            text = str(text).strip()
+            if text:
+                valid.append(i)
+                valid_texts.append(text)
+    
+    if not valid:
         return []
     
     # Check if Tesseract metadata columns are available
-    has_tesseract_metadata = all(col in valid_data.columns for col in ['block_num', 'par_num', 'line_num', 'word_num'])
+    tesseract_columns = ['block_num', 'par_num', 'line_num', 'word_num']
+    has_tesseract_metadata = all(col in columns for col in tesseract_columns)
+    
+    # Keep only the valid words' fields, as parallel lists
+    names = ['left', 'top', 'width', 'height']
+    if has_tesseract_metadata:
+        names += tesseract_columns
+    words = {name: [columns[name][i] for i in valid] for name in names}
+    words['text'] = valid_texts
     
     if has_tesseract_metadata:
         # Use Tesseract's native line detection (preferred method)
-        return _group_by_tesseract_lines(valid_data)
+        return _group_by_tesseract_lines(words)
     else:
         # Fall back to coordinate-based grouping
-        return _group_by_coordinates(valid_data, line_height_tolerance)
+        return _group_by_coordinates(words, line_height_tolerance)
 
 
-def _group_by_tesseract_lines(valid_data: pd.DataFrame, horizontal_gap_threshold: int = 100) -> List[TextBlock]:
+def _group_by_tesseract_lines(words: Dict[str, list], horizontal_gap_threshold: int = 100) -> List[TextBlock]:
     """
     Group words using Tesseract's native block/line metadata with horizontal gap detection.
     
@@ -56,62 +87,55 @@ def _group_by_tesseract_lines(valid_data: pd.DataFrame, horizontal_gap_threshold
     words are too far apart horizontally (e.g., in multi-column layouts).
     
     Args:
-        valid_data: Filtered DataFrame with OCR data
+        words: Filtered OCR words as parallel column lists (text stripped)
         horizontal_gap_threshold: Maximum horizontal gap in pixels between words
                                  in the same semantic line (default: 100)
     """
     # Sort by block, paragraph, line, then word number to get proper order
-    valid_data = valid_data.sort_values(['block_num', 'par_num', 'line_num', 'word_num'])
-    
-    lines = []
-    line_number = 0
-    
-    # Group words by (block_num, par_num, line_num)
-    grouped = valid_data.groupby(['block_num', 'par_num', 'line_num'])
-    
-    for group_key, group_data in grouped:
-        current_line_words = []
-        
-        for _, row in group_data.iterrows():
-            word_text = str(row['text']).strip()
-            word_top = row['top']
-            word_left = row['left']
-            word_width = row['width']
-            word_height = row['height']
-            
-            word_dict = {
-                'text': word_text,
-                'left': word_left,
-                'top': word_top,
-                'width': word_width,
-                'height': word_height
-            }
-            
-            # Check if this word is too far from the previous word horizontally
-            if current_line_words:
-                last_word = current_line_words[-1]
-                last_word_right = last_word['left'] + last_word['width']
-                horizontal_gap = word_left - last_word_right
-                
-                # If gap is too large, flush current line and start a new one
-                if horizontal_gap > horizontal_gap_threshold:
-                    lines.append(_create_text_block_from_words(current_line_words, line_number))
-                    line_number += 1
-                    current_line_words = [word_dict]
-                else:
-                    current_line_words.append(word_dict)
-            else:
-                current_line_words.append(word_dict)
-        
-        # Flush any remaining words in this Tesseract line
-        if current_line_words:
-            lines.append(_create_text_block_from_words(current_line_words, line_number))
-            line_number += 1
-    
-    return lines
+    # (lexsort is stable and takes its primary key last)
+    block_nums, par_nums, line_nums, word_nums = (
+        np.array(words[name])
+        for name in ('block_num', 'par_num', 'line_num', 'word_num')
+    )
+    order = np.lexsort((word_nums, line_nums, par_nums, block_nums))
+    
+    word_texts = words['text']
+    texts = [word_texts[i] for i in order.tolist()]
+    lefts = np.array(words['left'])[order]
+    tops = np.array(words['top'])[order]
+    rights = lefts + np.array(words['width'])[order]
+    bottoms = tops + np.array(words['height'])[order]
+    
+    # A new line starts wherever Tesseract's (block_num, par_num, line_num)
+    # changes, or where the gap after the previous word is too wide
+    keys = np.column_stack((block_nums, par_nums, line_nums))[order]
+    new_line = (np.any(keys[1:] != keys[:-1], axis=1) |
+                (lefts[1:] - rights[:-1] > horizontal_gap_threshold))
+    starts = np.concatenate(([0], np.flatnonzero(new_line) + 1))
+    
+    # Bounding box of each line, reduced over its run of words
+    min_lefts = np.minimum.reduceat(lefts, starts).tolist()
+    min_tops = np.minimum.reduceat(tops, starts).tolist()
+    max_rights = np.maximum.reduceat(rights, starts).tolist()
+    max_bottoms = np.maximum.reduceat(bottoms, starts).tolist()
+    bounds = starts.tolist() + [len(texts)]
+    
+    return [
+        TextBlock(
+            text=' '.join(texts[bounds[i]:bounds[i + 1]]),
+            bounding_box=BoundingBox(
+                x=min_lefts[i],
+                y=min_tops[i],
+                width=max_rights[i] - min_lefts[i],
+                height=max_bottoms[i] - min_tops[i]
+            ),
+            line_number=i
+        )
+        for i in range(len(min_lefts))
+    ]
 
 
-def _group_by_coordinates(valid_data: pd.DataFrame, line_height_tolerance: int) -> List[TextBlock]:
+def _group_by_coordinates(words: Dict[str, list], line_height_tolerance: int) -> List[TextBlock]:
     """
     Group words by vertical proximity (legacy/fallback method).
     
@@ -119,53 +143,33 @@ def _group_by_coordinates(valid_data: pd.DataFrame, line_height_tolerance: int)
     when metadata is unavailable (e.g., in tests or with other OCR engines).
     """
     # Sort by top coordinate, then left coordinate
-    valid_data = valid_data.sort_values(['top', 'left'])
-    
-    lines = []
-    current_line_words = []
+    word_tops, word_lefts = words['top'], words['left']
+    order = sorted(range(len(word_tops)), key=lambda i: (word_tops[i], word_lefts[i]))
+    
+    texts = [words['text'][i] for i in order]
+    lefts = [word_lefts[i] for i in order]
+    tops = [word_tops[i] for i in order]
+    widths = [words['width'][i] for i in order]
+    heights = [words['height'][i] for i in order]
+    
+    # A word starts a new line when it is too far below the first word of
+    # the current line
+    starts = [0]
     current_line_top = None
-    line_number = 0
-    
-    for _, row in valid_data.iterrows():
-        word_text = str(row['text']).strip()
-        word_top = row['top']
-        word_left = row['left']
-        word_width = row['width']
-        word_height = row['height']
-        
-        # Check if this word belongs to the current line
-        if current_line_top is None or abs(word_top - current_line_top) <= line_height_tolerance:
-            # Same line or first word
-            current_line_words.append({
-                'text': word_text,
-                'left': word_left,
-                'top': word_top,
-                'width': word_width,
-                'height': word_height
-            })
-            if current_line_top is None:
-                current_line_top = word_top
-        else:
-            # New line - flush current line
-            if current_line_words:
-                lines.append(_create_text_block_from_words(current_line_words, line_number))
-                line_number += 1
-            
-            # Start new line
-            current_line_words = [{
-                'text': word_text,
-                'left': word_left,
-                'top': word_top,
-                'width': word_width,
-                'height': word_height
-            }]
+    for i, word_top in enumerate(tops):
+        if current_line_top is None:
             current_line_top = word_top
-    
-    # Flush the last line
-    if current_line_words:
-        lines.append(_create_text_block_from_words(current_line_words, line_number))
-    
-    return lines
+        elif abs(word_top - current_line_top) > line_height_tolerance:
+            starts.append(i)
+            current_line_top = word_top
+    bounds = starts + [len(texts)]
+    
+    return [
+        _create_text_block_from_arrays(
+            texts, lefts, tops, widths, heights, bounds[i], bounds[i + 1], i
+        )
+        for i in range(len(starts))
+    ]
 
 
 def _clean_stray_characters(text_blocks: List[TextBlock]) -> List[TextBlock]:
@@ -193,7 +197,9 @@ def _clean_stray_characters(text_blocks: List[TextBlock]) -> List[TextBlock]:
         
         # Pattern: ends with space + single alphabetic character
         # Examples: "Vanilla e", "Recipe s", "Title i"
-        if re.match(r'^.+ [a-zA-Z]$', text):
+        # (cheap character checks first; the regex only confirms candidates)
+        if (len(text) >= 3 and text[-2] == ' ' and text[-1].isalpha()
+                and _STRAY_TAIL_RE.match(text)):
             # Strip the last 2 characters (space + letter)
             cleaned_text = text[:-2]
             # Create new TextBlock with cleaned text, preserving bounding box
@@ -233,8 +239,17 @@ def _sort_blocks_spatially(text_blocks: List[TextBlock],
     if not text_blocks:
         return []
     
+    # Read each block's position once; the helpers below sort and group
+    # block indices by these coordinate lists
+    xs = [b.bounding_box.x for b in text_blocks]
+    ys = [b.bounding_box.y for b in text_blocks]
+    
+    # Too few blocks for two real columns; column detection can't succeed
+    if len(text_blocks) < 2 * min_column_blocks:
+        return _sort_by_rows(text_blocks, xs, ys, row_tolerance)
+    
     # Detect potential columns by clustering x positions
-    x_positions = sorted([b.bounding_box.x for b in text_blocks])
+    x_positions = sorted(xs)
     
     # Group x positions into potential columns
     potential_columns = []
@@ -256,19 +271,21 @@ def _sort_blocks_spatially(text_blocks: List[TextBlock],
     # Decide sorting strategy based on column detection
     if len(real_columns) >= 2:
         # Multi-column layout detected - use column-based sorting
-        return _sort_by_columns(text_blocks, real_columns, column_threshold)
+        return _sort_by_columns(text_blocks, xs, ys, real_columns, column_threshold)
     else:
         # Single column or mixed layout - use row-based sorting
-        return _sort_by_rows(text_blocks, row_tolerance)
+        return _sort_by_rows(text_blocks, xs, ys, row_tolerance)
 
 
-def _sort_by_columns(text_blocks: List[TextBlock], column_x_groups: List[List[int]], 
-                     column_threshold: int) -> List[TextBlock]:
+def _sort_by_columns(text_blocks: List[TextBlock], xs: List[int], ys: List[int],
+                     column_x_groups: List[List[int]], column_threshold: int) -> List[TextBlock]:
     """
     Sort blocks by columns (for true multi-column layouts).
     
     Args:
         text_blocks: List of TextBlock objects
+        xs: x position of each block
+        ys: y position of each block
         column_x_groups: List of x-position groups for each column
         column_threshold: Distance threshold for column assignment
     
@@ -278,37 +295,30 @@ def _sort_by_columns(text_blocks: List[TextBlock], column_x_groups: List[List[in
     # Calculate average x for each column
     columns_x = [sum(col) / len(col) for col in column_x_groups]
     
-    # Assign each block to nearest column
-    def get_column_index(block: TextBlock) -> int:
-        block_x = block.bounding_box.x
-        min_dist = float('inf')
-        col_idx = 0
-        for idx, col_x in enumerate(columns_x):
-            dist = abs(block_x - col_x)
-            if dist < min_dist:
-                min_dist = dist
-                col_idx = idx
-        return col_idx
-    
-    # Group blocks by column
+    # Assign each block to its nearest column with one broadcast distance
+    # matrix; argmin keeps the first (leftmost) column on ties
+    x_array = np.array(xs, dtype=np.float64)
+    nearest = np.abs(x_array[:, None] - np.asarray(columns_x)[None, :]).argmin(axis=1)
+    
+    # Group block indices by column
     column_blocks = {i: [] for i in range(len(columns_x))}
-    for block in text_blocks:
-        col_idx = get_column_index(block)
-        column_blocks[col_idx].append(block)
+    for i, col_idx in enumerate(nearest.tolist()):
+        column_blocks[col_idx].append(i)
     
     # Sort each column by y position (top to bottom)
     for col_idx in column_blocks:
-        column_blocks[col_idx].sort(key=lambda b: b.bounding_box.y)
+        column_blocks[col_idx].sort(key=ys.__getitem__)
     
     # Concatenate columns left to right
     result = []
     for col_idx in sorted(column_blocks.keys()):
-        result.extend(column_blocks[col_idx])
+        result.extend(text_blocks[i] for i in column_blocks[col_idx])
     
     return result
 
 
-def _sort_by_rows(text_blocks: List[TextBlock], row_tolerance: int) -> List[TextBlock]:
+def _sort_by_rows(text_blocks: List[TextBlock], xs: List[int], ys: List[int],
+                  row_tolerance: int) -> List[TextBlock]:
     """
     Sort blocks by rows (for single-column or mixed layouts).
     
@@ -317,6 +327,8 @@ def _sort_by_rows(text_blocks: List[TextBlock], row_tolerance: int) -> List[Text
     
     Args:
         text_blocks: List of TextBlock objects
+        xs: x position of each block
+        ys: y position of each block
         row_tolerance: Vertical distance to consider blocks on the same row
     
     Returns:
@@ -325,56 +337,70 @@ def _sort_by_rows(text_blocks: List[TextBlock], row_tolerance: int) -> List[Text
     if not text_blocks:
         return []
     
-    # Sort by y first to find rows
-    sorted_by_y = sorted(text_blocks, key=lambda b: b.bounding_box.y)
+    # Sort block indices by y first to find rows
+    sorted_by_y = sorted(range(len(text_blocks)), key=ys.__getitem__)
     
     # Group into rows based on vertical proximity
     rows = []
     current_row = [sorted_by_y[0]]
+    # Running sum of the row's y positions, so the average is O(1) per block
+    row_y_sum = ys[sorted_by_y[0]]
     
-    for block in sorted_by_y[1:]:
+    for i in sorted_by_y[1:]:
         # Check if this block is close enough to be in the current row
-        row_y_avg = sum(b.bounding_box.y for b in current_row) / len(current_row)
-        if abs(block.bounding_box.y - row_y_avg) <= row_tolerance:
-            current_row.append(block)
+        block_y = ys[i]
+        row_y_avg = row_y_sum / len(current_row)
+        if abs(block_y - row_y_avg) <= row_tolerance:
+            current_row.append(i)
+            row_y_sum += block_y
         else:
             # Start new row
-            current_row.sort(key=lambda b: b.bounding_box.x)  # Sort row left-to-right
+            current_row.sort(key=xs.__getitem__)  # Sort row left-to-right
             rows.append(current_row)
-            current_row = [block]
+            current_row = [i]
+            row_y_sum = block_y
     
     # Add last row
     if current_row:
-        current_row.sort(key=lambda b: b.bounding_box.x)
+        current_row.sort(key=xs.__getitem__)
         rows.append(current_row)
     
     # Flatten rows into single list
-    result = []
-    for row in rows:
-        result.extend(row)
-    
-    return result
+    return [text_blocks[i] for row in rows for i in row]
 
 
-def _create_text_block_from_words(words: List[dict], line_number: int) -> TextBlock:
+def _create_text_block_from_arrays(texts: Sequence[str], lefts: Sequence[int], tops: Sequence[int],
+                                   widths: Sequence[int], heights: Sequence[int],
+                                   start: int, stop: int, line_number: int) -> TextBlock:
     """
-    Create a TextBlock from a list of words on the same line.
+    Create a TextBlock from a run of words on the same line.
+    
+    Words are given as parallel column lists, so callers don't build a dict
+    per word.
     
     Args:
-        words: List of word dictionaries with text and coordinates
+        texts: Word texts
+        lefts: Word left coordinates
+        tops: Word top coordinates
+        widths: Word widths
+        heights: Word heights
+        start: Index of the first word of the line
+        stop: Index one past the last word of the line
         line_number: The line number for this text block
     
     Returns:
         TextBlock with combined text and bounding box
     """
     # Combine text with spaces
-    combined_text = ' '.join(word['text'] for word in words)
+    combined_text = ' '.join(texts[start:stop])
     
     # Calculate bounding box that encompasses all words
-    min_left = min(word['left'] for word in words)
-    max_right = max(word['left'] + word['width'] for word in words)
-    min_top = min(word['top'] for word in words)
-    max_bottom = max(word['top'] + word['height'] for word in words)
+    line_lefts = lefts[start:stop]
+    line_tops = tops[start:stop]
+    min_left = min(line_lefts)
+    max_right = max(map(operator.add, line_lefts, widths[start:stop]))
+    min_top = min(line_tops)
+    max_bottom = max(map(operator.add, line_tops, heights[start:stop]))
     
     bbox = BoundingBox(
         x=min_left,
@@ -398,9 +424,33 @@ def process_page_with_ocr(image: Image.Image, page_number: int, clean_stray_char
     Returns:
         PageData object containing OCR results
     """
-    # Get OCR data with word-level bounding boxes
-    ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DATAFRAME)
+    # Tesseract binarizes a grayscale copy anyway; handing it one byte per
+    # pixel cuts the temporary image pytesseract encodes and writes to a third
+    ocr_image = image if image.mode == 'L' else image.convert('L')
+    
+    # Get OCR data with word-level bounding boxes, as plain column lists
+    ocr_data = pytesseract.image_to_data(ocr_image, output_type=pytesseract.Output.DICT)
+    
+    return _build_page_data(ocr_data, page_number, image.width, image.height,
+                            clean_stray_chars=clean_stray_chars)
+
+
+def _build_page_data(ocr_data: Mapping[str, Sequence], page_number: int,
+                     image_width: int, image_height: int,
+                     clean_stray_chars: bool = True) -> PageData:
+    """
+    Turn one page's word-level OCR data into a PageData of sorted lines.
     
+    Args:
+        ocr_data: Tesseract TSV columns for the page (pytesseract Output.DICT)
+        page_number: Page number (1-indexed)
+        image_width: Width of the page image in pixels
+        image_height: Height of the page image in pixels
+        clean_stray_chars: Whether to apply stray character cleaning (default: True)
+    
+    Returns:
+        PageData object containing OCR results
+    """
     # Group words into lines
     text_blocks = group_words_into_lines(ocr_data)
     
@@ -419,30 +469,167 @@ def process_page_with_ocr(image: Image.Image, page_number: int, clean_stray_char
     return PageData(
         page_number=page_number,
         text_blocks=text_blocks,
-        image_width=image.width,
-        image_height=image.height
+        image_width=image_width,
+        image_height=image_height
     )
 
 
-def process_pdf(pdf_path: str, dpi: int = 300, clean_stray_chars: bool = True) -> List[PageData]:
+def _split_tsv_pages(ocr_data: Mapping[str, Sequence], page_count: int) -> List[Dict[str, list]]:
     """
-    Process a PDF file and extract OCR data for all pages.
+    Split multi-image Tesseract TSV columns into one set of columns per image.
+    
+    Args:
+        ocr_data: TSV columns from a single Tesseract run over several images
+        page_count: Number of images in the run
+    
+    Returns:
+        Column dicts in image order; images without rows get an empty dict
+    """
+    pages = [{} for _ in range(page_count)]
+    page_nums = ocr_data.get('page_num') or []
+    
+    # Rows are written page by page, so each page is one contiguous run
+    start = 0
+    for stop in range(1, len(page_nums) + 1):
+        if stop == len(page_nums) or page_nums[stop] != page_nums[start]:
+            pages[page_nums[start] - 1] = {
+                name: values[start:stop] for name, values in ocr_data.items()
+            }
+            start = stop
+    
+    return pages
+
+
+def render_pdf(pdf_path: str, dpi: int = 300) -> List[Image.Image]:
+    """
+    Rasterize every page of a PDF file as grayscale images.
     
     Args:
         pdf_path: Path to the PDF file
         dpi: Resolution for converting PDF pages to images
+    
+    Returns:
+        List of grayscale ('L' mode) PIL Images, one per page
+    """
+    return convert_from_path(pdf_path, dpi=dpi, grayscale=True)
+
+
+def render_pdf_to_files(pdf_path: str, output_folder: str, dpi: int = 300) -> List[str]:
+    """
+    Rasterize every page of a PDF file to grayscale image files on disk.
+    
+    Unlike render_pdf, no page images are kept in memory; callers open each
+    page when they are ready to process it (see process_page_file).
+    
+    Args:
+        pdf_path: Path to the PDF file
+        output_folder: Directory to write page images into (created if missing)
+        dpi: Resolution for converting PDF pages to images
+    
+    Returns:
+        Paths of the page images, in page order
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    return convert_from_path(pdf_path, dpi=dpi, output_folder=output_folder,
+                             grayscale=True, paths_only=True)
+
+
+def process_page_file(image_path: str, page_number: int, clean_stray_chars: bool = True) -> PageData:
+    """
+    Open a rendered page image and process it with OCR.
+    
+    The image is only held in memory while this page is being processed.
+    
+    Args:
+        image_path: Path to the page image
+        page_number: Page number (1-indexed)
         clean_stray_chars: Whether to apply stray character cleaning (default: True)
     
     Returns:
-        List of PageData objects, one per page
+        PageData object containing OCR results
+    """
+    with Image.open(image_path) as image:
+        return process_page_with_ocr(image, page_number, clean_stray_chars=clean_stray_chars)
+
+
+def process_page_files(image_paths: Sequence[str], first_page_number: int = 1,
+                       clean_stray_chars: bool = True) -> List[PageData]:
     """
-    # Convert PDF to images
-    images = convert_from_path(pdf_path, dpi=dpi)
+    OCR several rendered page images with a single Tesseract run.
+    
+    Tesseract is given a list file naming every image, so its process start
+    and model load are paid once rather than once per page. Results match
+    calling process_page_file on each image.
     
-    # Process each page
-    pages_data = []
-    for page_num, image in enumerate(images, start=1):
-        page_data = process_page_with_ocr(image, page_num, clean_stray_chars=clean_stray_chars)
-        pages_data.append(page_data)
+    Args:
+        image_paths: Paths to the page images, in page order
+        first_page_number: Page number of the first image (1-indexed)
+        clean_stray_chars: Whether to apply stray character cleaning (default: True)
     
-    return pages_data
+    Returns:
+        List of PageData objects, one per image
+    """
+    if not image_paths:
+        return []
+    
+    with tempfile.TemporaryDirectory(prefix="pdf_ocr_diff_tsv_") as work_dir:
+        list_path = os.path.join(work_dir, "pages.txt")
+        with open(list_path, "w") as list_file:
+            list_file.write("\n".join(image_paths) + "\n")
+        
+        output_base = os.path.join(work_dir, "ocr")
+        run_tesseract(list_path, output_base, "tsv", None, "-c tessedit_create_tsv=1")
+        with open(output_base + ".tsv", encoding="utf-8") as tsv_file:
+            ocr_data = file_to_dict(tsv_file.read(), "\t", -1)
+    
+    pages = []
+    for i, (image_path, page_ocr_data) in enumerate(
+            zip(image_paths, _split_tsv_pages(ocr_data, len(image_paths)))):
+        # Image.open only reads the header, which is enough for the size
+        with Image.open(image_path) as image:
+            image_width, image_height = image.size
+        pages.append(_build_page_data(page_ocr_data, first_page_number + i,
+                                      image_width, image_height,
+                                      clean_stray_chars=clean_stray_chars))
+    return pages
+
+
+def process_pdf(pdf_path: str, dpi: int = 300, clean_stray_chars: bool = True,
+                max_workers: Optional[int] = None) -> List[PageData]:
+    """
+    Process a PDF file and extract OCR data for all pages.
+    
+    Pages are rendered to a temporary directory and OCR'd from there by a
+    single Tesseract run (one per worker), so page images are never all held
+    in memory and Tesseract's startup cost is paid once rather than per page.
+    
+    Args:
+        pdf_path: Path to the PDF file
+        dpi: Resolution for converting PDF pages to images
+        clean_stray_chars: Whether to apply stray character cleaning (default: True)
+        max_workers: Number of Tesseract runs to split the pages across, run
+                     in parallel threads. None or 1 uses a single run.
+    
+    Returns:
+        List of PageData objects, one per page
+    """
+    with tempfile.TemporaryDirectory(prefix="pdf_ocr_diff_") as output_folder:
+        # Convert PDF to page images on disk
+        image_paths = render_pdf_to_files(pdf_path, output_folder, dpi=dpi)
+        
+        if max_workers is not None and max_workers > 1 and len(image_paths) > 1:
+            # One Tesseract run per contiguous chunk of pages; pytesseract
+            # runs Tesseract as a subprocess, so threads run the chunks
+            # concurrently and map() keeps them in page order
+            chunk_size = -(-len(image_paths) // max_workers)
+            starts = range(0, len(image_paths), chunk_size)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                chunks = executor.map(
+                    partial(process_page_files, clean_stray_chars=clean_stray_chars),
+                    [image_paths[start:start + chunk_size] for start in starts],
+                    [start + 1 for start in starts]
+                )
+                return [page for chunk in chunks for page in chunk]
+        
+        # OCR every page in one Tesseract run
+        return process_page_files(image_paths, clean_stray_chars=clean_stray_chars)
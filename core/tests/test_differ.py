@@ -1,13 +1,30 @@
 """Tests for differ module."""
 
+import random
+
+import pytest
+
+from pdf_ocr_diff import differ
 from pdf_ocr_diff.models import (
     BoundingBox, TextBlock, PageData, DiffOperation
 )
 from pdf_ocr_diff.differ import (
-    compare_pages, compare_pdfs, _compute_char_diffs, _infer_operation_from_char_diffs
+    compare_pages, compare_pdfs, iter_compare_pdfs, _compute_char_diffs,
+    _infer_operation_from_char_diffs, _generate_unified_diff, get_unified_diff, _lcs_opcodes,
+    _lcs_matching_blocks, _normalize_matching_blocks
 )
 
 
+@pytest.fixture(autouse=True, params=["python", "rapidfuzz"])
+def word_diff_backend(request, monkeypatch):
+    """Run every test with the pure-Python and the rapidfuzz word diff."""
+    if request.param == "python":
+        monkeypatch.setattr(differ, "indel", None)
+    elif differ.indel is None:
+        pytest.skip("rapidfuzz is not installed")
+    return request.param
+
+
 def test_compare_pages_identical():
     """Test comparing two identical pages."""
     bbox1 = BoundingBox(x=10, y=20, width=100, height=50)
@@ -43,6 +60,27 @@ def test_compare_pages_different():
     assert len(result[0].bounding_boxes_b) == 1
 
 
+def test_get_unified_diff_builds_from_labels():
+    """Test that compare_pages defers the unified diff to get_unified_diff."""
+    bbox = BoundingBox(x=10, y=20, width=100, height=50)
+    page_a = PageData(page_number=1, text_blocks=[TextBlock(text="Text A", bounding_box=bbox)])
+    page_b = PageData(page_number=1, text_blocks=[TextBlock(text="Text B", bounding_box=bbox)])
+    
+    item = compare_pages(page_a, page_b)[0]
+    
+    assert item.unified_diff is None
+    assert "unified_diff" not in item.to_dict()
+    
+    unified_diff = get_unified_diff(item)
+    assert unified_diff.startswith("--- page_1_line_0\n+++ page_1_line_0")
+    assert item.unified_diff == unified_diff
+    assert item.to_dict()["unified_diff"] == unified_diff
+    
+    # A value passed by the caller is kept as is
+    item.unified_diff = "custom"
+    assert get_unified_diff(item) == "custom"
+
+
 def test_compare_pages_missing_page_a():
     """Test comparing when page A is missing."""
     bbox = BoundingBox(x=10, y=20, width=100, height=50)
@@ -138,6 +176,43 @@ def test_compare_pdfs_unequal_pages():
     assert len(result.diff_items) > 0
 
 
+def test_compare_pdfs_parallel_matches_serial():
+    """Test that comparing pages in worker processes gives the serial result."""
+    bbox = BoundingBox(x=10, y=20, width=100, height=50)
+    pages_a = [
+        PageData(page_number=n, text_blocks=[TextBlock(text=f"Page {n} A", bounding_box=bbox)])
+        for n in range(1, 4)
+    ]
+    pages_b = [
+        PageData(page_number=n, text_blocks=[TextBlock(text=f"Page {n} B", bounding_box=bbox)])
+        for n in range(1, 3)
+    ]
+    
+    serial = compare_pdfs(pages_a, pages_b, "file_a.pdf", "file_b.pdf")
+    parallel = compare_pdfs(pages_a, pages_b, "file_a.pdf", "file_b.pdf", max_workers=2)
+    
+    assert parallel.to_dict() == serial.to_dict()
+
+
+def test_iter_compare_pdfs_matches_compare_pdfs():
+    """Test that streaming diff items yields the same items in page order."""
+    bbox = BoundingBox(x=10, y=20, width=100, height=50)
+    pages_a = [
+        PageData(page_number=1, text_blocks=[TextBlock(text="Page one", bounding_box=bbox)]),
+        PageData(page_number=2, text_blocks=[TextBlock(text="Page two", bounding_box=bbox)])
+    ]
+    pages_b = [
+        PageData(page_number=1, text_blocks=[TextBlock(text="Page 1", bounding_box=bbox)])
+    ]
+    
+    items = iter_compare_pdfs(pages_a, pages_b)
+    
+    assert not isinstance(items, list)
+    items = list(items)
+    assert [(item.page_a, item.page_b) for item in items] == [(1, 1), (2, None)]
+    assert items == compare_pdfs(pages_a, pages_b, "a.pdf", "b.pdf").diff_items
+
+
 def test_word_level_diffs():
     """Test that diffs work at word level, not character level."""
     text_a = "Hello this is Michael"
@@ -171,6 +246,71 @@ def test_word_level_insertion():
     assert char_diffs[2].text_a == "Michael"
 
 
+def test_identical_text_short_circuits():
+    """Test that identical texts produce a single equal diff and no unified diff."""
+    text = "Hello this is Michael"
+    
+    char_diffs = _compute_char_diffs(text, text)
+    
+    assert len(char_diffs) == 1
+    assert char_diffs[0].operation == 'equal'
+    assert char_diffs[0].text_a == text
+    assert char_diffs[0].end_a == len(text)
+    assert _compute_char_diffs("", "") == []
+    assert _generate_unified_diff(text, text) == ""
+
+
+def test_lcs_opcodes_match_sequence_matcher_shape():
+    """Test that LCS opcodes cover both sequences like SequenceMatcher's."""
+    a = ["Hello", " ", "this", " ", "is", " ", "Michael"]
+    b = ["Hello", " ", "that", " ", "is", " ", "not", " ", "Michael"]
+    
+    assert _lcs_opcodes(a, b) == [
+        ('equal', 0, 2, 0, 2),
+        ('replace', 2, 3, 2, 3),
+        ('equal', 3, 6, 3, 6),
+        ('insert', 6, 6, 6, 8),
+        ('equal', 6, 7, 8, 9),
+    ]
+    assert _lcs_opcodes([], b) == [('insert', 0, 0, 0, 9)]
+    assert _lcs_opcodes(a, []) == [('delete', 0, 7, 0, 0)]
+    assert _lcs_opcodes([], []) == []
+
+
+def test_lcs_opcodes_break_ties_canonically():
+    """Test that equally long alignments resolve the same way on every backend."""
+    assert _lcs_opcodes(list("xxxyyy"), list("yyyxxx")) == [
+        ('insert', 0, 0, 0, 3),
+        ('equal', 0, 3, 3, 6),
+        ('delete', 3, 6, 6, 6),
+    ]
+    assert _lcs_opcodes(list("abcab"), list("bacba")) == [
+        ('insert', 0, 0, 0, 1),
+        ('equal', 0, 1, 1, 2),
+        ('insert', 1, 1, 2, 3),
+        ('equal', 1, 2, 3, 4),
+        ('delete', 2, 3, 4, 4),
+        ('equal', 3, 4, 4, 5),
+        ('delete', 4, 5, 5, 5),
+    ]
+
+
+def test_lcs_matching_blocks_match_rapidfuzz():
+    """Test that the pure-Python LCS picks the same alignment as rapidfuzz."""
+    indel = pytest.importorskip("rapidfuzz.distance").Indel
+    
+    rng = random.Random(0)
+    for _ in range(2000):
+        vocab = rng.choice([["a", "b"], ["a", "b", "c"], list("abcdefg"), ["the", " ", "x"]])
+        size = rng.choice([5, 15, 100])
+        a = [rng.choice(vocab) for _ in range(rng.randint(0, size))]
+        b = [rng.choice(vocab) for _ in range(rng.randint(0, size))]
+        expected = _normalize_matching_blocks(
+            a, b, indel.opcodes(a, b).as_matching_blocks()
+        )
+        assert _lcs_matching_blocks(a, b) == expected, (a, b)
+
+
 def test_operation_inference_insert_only():
     """Test that insert-only changes are classified as insert."""
     text_a = "Tips"
@@ -263,3 +403,30 @@ def test_spatially_close_diffs_merged():
     assert "Line one" in result[0].text_a
     assert "Line two" in result[0].text_a
     assert "\n" in result[0].text_a  # Newline preserved
+
+
+def test_merged_replacements_spliced_from_line_diffs():
+    """Test that merging word-for-word line changes reuses the per-line diffs."""
+    bbox1 = BoundingBox(x=10, y=20, width=100, height=20)
+    bbox2 = BoundingBox(x=10, y=50, width=100, height=20)
+    
+    block_a1 = TextBlock(text="Total due 10", bounding_box=bbox1, line_number=0)
+    block_a2 = TextBlock(text="Paid by cash", bounding_box=bbox2, line_number=1)
+    
+    block_b1 = TextBlock(text="Total due 12", bounding_box=bbox1, line_number=0)
+    block_b2 = TextBlock(text="Paid by card", bounding_box=bbox2, line_number=1)
+    
+    page_a = PageData(page_number=1, text_blocks=[block_a1, block_a2])
+    page_b = PageData(page_number=1, text_blocks=[block_b1, block_b2])
+    
+    result = compare_pages(page_a, page_b)
+    
+    assert len(result) == 1
+    assert result[0].operation == DiffOperation.REPLACE
+    assert [(d.operation, d.text_a, d.text_b) for d in result[0].char_diffs] == [
+        ('equal', "Total due ", "Total due "),
+        ('replace', "10", "12"),
+        ('equal', "\nPaid by ", "\nPaid by "),
+        ('replace', "cash", "card"),
+    ]
+    assert result[0].char_diffs[-1].start_a == len("Total due 10\nPaid by ")
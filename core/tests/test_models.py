@@ -53,6 +53,27 @@ def test_page_data_to_dict():
     assert result["image_height"] == 1000
 
 
+def test_page_data_texts():
+    """Test PageData.texts/bboxes list block data in order and are cached."""
+    bbox = BoundingBox(x=10, y=20, width=100, height=50)
+    page = PageData(
+        page_number=1,
+        text_blocks=[
+            TextBlock(text="Line 1", bounding_box=bbox, line_number=0),
+            TextBlock(text="Line 2", bounding_box=bbox, line_number=1)
+        ]
+    )
+    
+    assert page.texts == ("Line 1", "Line 2")
+    assert page.texts is page.texts
+    assert page.texts[0] is PageData(page_number=2, text_blocks=[
+        TextBlock(text="".join(["Line", " 1"]), bounding_box=bbox)
+    ]).texts[0]
+    assert "texts" not in page.to_dict()
+    assert page.bboxes == (bbox, bbox)
+    assert page.bboxes is page.bboxes
+
+
 def test_diff_item_to_dict():
     """Test DiffItem serialization."""
     bbox_a = BoundingBox(x=10, y=20, width=100, height=50)
@@ -78,6 +99,65 @@ def test_diff_item_to_dict():
     assert len(result["bounding_boxes_b"]) == 1
 
 
+def test_diff_item_to_dict_unified_diff():
+    """Test that a unified diff passed to DiffItem is serialized unless excluded."""
+    diff_item = DiffItem(
+        operation=DiffOperation.REPLACE,
+        page_a=1,
+        page_b=1,
+        text_a="Old text",
+        text_b="New text",
+        unified_diff="--- a\n+++ b\n@@ -1 +1 @@\n-Old text\n+New text"
+    )
+    
+    assert diff_item.to_dict()["unified_diff"] == diff_item.unified_diff
+    assert "unified_diff" not in diff_item.to_dict(include_unified_diff=False)
+    
+    # Labels alone don't build a diff; that is differ.get_unified_diff's job
+    labeled = DiffItem(
+        operation=DiffOperation.REPLACE,
+        page_a=1,
+        page_b=1,
+        text_a="Old text",
+        text_b="New text",
+        unified_diff_labels=("a", "b")
+    )
+    assert labeled.unified_diff is None
+    assert "unified_diff" not in labeled.to_dict()
+
+
+def test_bounding_box_pack_many():
+    """Test packing bounding boxes into a flat list."""
+    boxes = [
+        BoundingBox(x=10, y=20, width=100, height=50),
+        BoundingBox(x=15, y=25, width=95, height=45)
+    ]
+    
+    assert BoundingBox.pack_many(boxes) == [10, 20, 100, 50, 15, 25, 95, 45]
+    assert BoundingBox.pack_many([]) == []
+
+
+def test_diff_item_to_dict_flat_bboxes():
+    """Test DiffItem serialization with flat bounding boxes."""
+    bbox_a = BoundingBox(x=10, y=20, width=100, height=50)
+    
+    diff_item = DiffItem(
+        operation=DiffOperation.DELETE,
+        page_a=1,
+        page_b=1,
+        text_a="Old text",
+        text_b=None,
+        bounding_boxes_a=[bbox_a],
+        bounding_boxes_b=[]
+    )
+    result = diff_item.to_dict(flat_bboxes=True)
+    
+    assert result["bounding_boxes_a_flat"] == [10, 20, 100, 50]
+    assert result["bounding_boxes_b_flat"] == []
+    assert "bounding_boxes_a" not in result
+    assert "bounding_boxes_b" not in result
+
+
 def test_diff_result_to_dict():
     """Test DiffResult serialization."""
     bbox = BoundingBox(x=10, y=20, width=100, height=50)
@@ -1,7 +1,48 @@
 """Tests for OCR module."""
 
 import pandas as pd
-from pdf_ocr_diff.ocr import group_words_into_lines, _create_text_block_from_words
+from PIL import Image
+
+from pdf_ocr_diff import ocr
+from pdf_ocr_diff.ocr import (
+    group_words_into_lines, process_page_files, process_pdf,
+    _create_text_block_from_arrays, _split_tsv_pages
+)
+
+_TSV_HEADER = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+               "left", "top", "width", "height", "conf", "text")
+
+
+def _word_rows(words):
+    """Tesseract TSV rows (without page_num) for one line of (text, left) words."""
+    rows = [(1, 0, 0, 0, 0, 0, 0, 800, 600, -1, "")]
+    for word_num, (text, left) in enumerate(words, start=1):
+        rows.append((5, 1, 1, 1, word_num, left, 20, 40, 15, 95, text))
+    return rows
+
+
+def _fake_run_tesseract(rows_by_image):
+    """Stand-in for pytesseract's run_tesseract over a list file of images."""
+    def run_tesseract(input_filename, output_filename_base, extension, lang, config=''):
+        with open(input_filename) as list_file:
+            image_paths = list_file.read().split()
+        lines = ["\t".join(_TSV_HEADER)]
+        for page_num, image_path in enumerate(image_paths, start=1):
+            for level, *rest in rows_by_image[image_path]:
+                lines.append("\t".join(map(str, (level, page_num, *rest))))
+        with open(output_filename_base + ".tsv", "w") as tsv_file:
+            tsv_file.write("\n".join(lines) + "\n")
+    return run_tesseract
+
+
+def _page_images(tmp_path, count):
+    """Write blank page images of distinct widths and return their paths."""
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"page-{i}.png"
+        Image.new("L", (800 + i, 600)).save(path)
+        paths.append(str(path))
+    return paths
 
 
 def test_group_words_into_lines_empty():
@@ -78,14 +119,37 @@ def test_group_words_filters_invalid_data():
     assert result[0].text == "Valid Also valid"
 
 
-def test_create_text_block_from_words():
-    """Test creating a text block from word data."""
-    words = [
-        {'text': 'Hello', 'left': 10, 'top': 20, 'width': 40, 'height': 15},
-        {'text': 'World', 'left': 60, 'top': 22, 'width': 50, 'height': 13}
-    ]
+def test_group_words_into_lines_from_dict():
+    """Test grouping pytesseract Output.DICT data with Tesseract line metadata."""
+    data = {
+        'text': ['', 'World', 'Hello', 'Next', ''],
+        'conf': [-1, 96, 95, 90, 91],
+        'block_num': [1, 1, 1, 1, 1],
+        'par_num': [1, 1, 1, 1, 1],
+        'line_num': [0, 1, 1, 2, 2],
+        'word_num': [0, 2, 1, 1, 2],
+        'left': [0, 60, 10, 10, 50],
+        'top': [0, 20, 20, 50, 50],
+        'width': [200, 50, 40, 40, 10],
+        'height': [80, 15, 15, 15, 15]
+    }
+    
+    result = group_words_into_lines(data)
+    
+    assert [block.text for block in result] == ["Hello World", "Next"]
+    assert result[0].bounding_box.width == 100  # 60 + 50 - 10
+    assert result[1].line_number == 1
+
+
+def test_create_text_block_from_arrays():
+    """Test creating a text block from a run of word data."""
+    texts = ['Skip', 'Hello', 'World']
+    lefts = [0, 10, 60]
+    tops = [0, 20, 22]
+    widths = [5, 40, 50]
+    heights = [5, 15, 13]
     
-    block = _create_text_block_from_words(words, line_number=5)
+    block = _create_text_block_from_arrays(texts, lefts, tops, widths, heights, 1, 3, line_number=5)
     
     assert block.text == "Hello World"
     assert block.line_number == 5
@@ -94,3 +158,61 @@ def test_create_text_block_from_words():
     assert block.bounding_box.y == 20
     assert block.bounding_box.width == 100  # 60 + 50 - 10
     assert block.bounding_box.height == 15  # 22 + 13 - 20
+
+
+def test_split_tsv_pages():
+    """Test splitting multi-image TSV columns into per-image columns."""
+    data = {
+        'page_num': [1, 1, 3],
+        'text': ['', 'Hello', 'Later'],
+    }
+    
+    pages = _split_tsv_pages(data, 3)
+    
+    assert pages[0] == {'page_num': [1, 1], 'text': ['', 'Hello']}
+    assert pages[1] == {}
+    assert pages[2] == {'page_num': [3], 'text': ['Later']}
+
+
+def test_process_page_files_single_run(tmp_path, monkeypatch):
+    """Test OCR of several page images in one Tesseract run."""
+    paths = _page_images(tmp_path, 3)
+    rows_by_image = {
+        paths[0]: _word_rows([("Hello", 10), ("World", 60)]),
+        paths[1]: _word_rows([]),  # Page without any words
+        paths[2]: _word_rows([("Last", 10)]),
+    }
+    fake = _fake_run_tesseract(rows_by_image)
+    calls = []
+    
+    def run_tesseract(*args):
+        calls.append(args)
+        fake(*args)
+    
+    monkeypatch.setattr(ocr, "run_tesseract", run_tesseract)
+    
+    pages = process_page_files(paths, first_page_number=5)
+    
+    assert len(calls) == 1
+    assert [page.page_number for page in pages] == [5, 6, 7]
+    assert [[block.text for block in page.text_blocks] for page in pages] == [
+        ["Hello World"], [], ["Last"]
+    ]
+    assert [page.image_width for page in pages] == [800, 801, 802]
+    assert process_page_files([]) == []
+
+
+def test_process_pdf_splits_pages_across_runs(tmp_path, monkeypatch):
+    """Test that process_pdf keeps page order when OCR runs in several chunks."""
+    paths = _page_images(tmp_path, 5)
+    rows_by_image = {path: _word_rows([(f"Page{i + 1}", 10)]) for i, path in enumerate(paths)}
+    monkeypatch.setattr(ocr, "run_tesseract", _fake_run_tesseract(rows_by_image))
+    monkeypatch.setattr(ocr, "render_pdf_to_files", lambda pdf_path, output_folder, dpi=300: paths)
+    
+    for max_workers in (None, 2, 10):
+        pages = process_pdf("doc.pdf", max_workers=max_workers)
+        
+        assert [page.page_number for page in pages] == [1, 2, 3, 4, 5]
+        assert [page.text_blocks[0].text for page in pages] == [
+            "Page1", "Page2", "Page3", "Page4", "Page5"
+        ]